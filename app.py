@@ -1,128 +1,277 @@
-from flask import Flask, render_template, request, redirect, flash, request, url_for, session, current_app, jsonify, send_from_directory
+from flask import Flask, render_template, request, redirect, flash, request, url_for, session, current_app, jsonify, send_from_directory, abort
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask.cli import with_appcontext
-from flask_wtf.csrf import CSRFProtect, generate_csrf
-from flask_migrate import Migrate
+from flask_wtf.csrf import CSRFProtect
+from flask_migrate import Migrate, stamp
+from collections.abc import Mapping
 from functools import wraps
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.security import check_password_hash
 from dotenv import load_dotenv
 from datetime import timedelta
 import os
 import click
-import requests
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import load_only, with_expression
 
 from model import db, Admin, AuditLog, User, ContactMessage, Review
+from recaptcha import RecaptchaVerifier
+from ingest import SubmissionQueue, ValidationError, submission_committed
+from audit import AuditSink, AuditRetention
+from cache import ResponseCache
+from prerender import StaticPages
+from images import ImagePipeline
+from assets import AssetManifest
+from pagination import keyset_paginate, approximate_count
+from queries import inquiry_query, option_filters
+from export import EXPORTS, EXPORT_FORMATS, export_response, export_command
+from stats import DashboardStats
+from dbpool import EnginePool
+from replica import ReadReplica
+from identity import AdminIdentityCache
+from auth import LoginGuard, LoginBusy
+from sessions import ServerSessions
+from metrics import RequestMetrics
+from compression import Compression
+from sitemap import Sitemap
+from screening import SubmissionScreen
+from inquiry_options import InquiryOptionIndex, FIELDS as OPTION_FIELDS
+
+# ---------- EXTENSIONS ----------
+# Created unbound; create_app() attaches them to an application
+migrate = Migrate()
+csrf = CSRFProtect()
+server_sessions = ServerSessions()
+engine_pool = EnginePool()
+read_replica = ReadReplica()
+request_metrics = RequestMetrics()
+compression = Compression()
+login_manager = LoginManager()
+login_manager.login_view = "admin_login"
+identity_cache = AdminIdentityCache()
+login_guard = LoginGuard()
+recaptcha = RecaptchaVerifier()
+submission_queue = SubmissionQueue()
+submission_screen = SubmissionScreen()
+audit_sink = AuditSink()
+audit_retention = AuditRetention()
+response_cache = ResponseCache()
+dashboard_stats = DashboardStats()
+inquiry_options = InquiryOptionIndex()
+static_pages = StaticPages()
+image_pipeline = ImagePipeline()
+assets = AssetManifest()
+sitemap = Sitemap()
+
+# New reviews change the home page testimonials
+submission_committed.connect(response_cache.invalidate, sender="review", weak=False)
+
+# Views register here and are added to each app by create_app(), keeping the
+# endpoint names url_for() already uses
+_routes = []
+
+def route(rule, **options):
+    def decorator(view):
+        _routes.append((rule, view, options))
+        return view
+    return decorator
+
+def database_url_from_env(name="DATABASE_URL"):
+    database_url = (os.getenv(name) or "").strip()
+
+    # Render and some providers may still expose postgres:// URLs.
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+    # External Render PostgreSQL requires SSL.
+    if database_url and "render.com" in database_url and "sslmode=" not in database_url:
+        separator = "&" if "?" in database_url else "?"
+        database_url = f"{database_url}{separator}sslmode=require"
+
+    return database_url
 
-app = Flask(__name__)
-load_dotenv()
-
-# 🔐 Secret key (required for sessions & login)
-app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
-
-# 🗄 Database config
-database_url = (os.getenv("DATABASE_URL") or "").strip()
-
-# Render and some providers may still expose postgres:// URLs.
-if database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql://", 1)
-
-# External Render PostgreSQL requires SSL.
-if database_url and "render.com" in database_url and "sslmode=" not in database_url:
-    separator = "&" if "?" in database_url else "?"
-    database_url = f"{database_url}{separator}sslmode=require"
+# ================================
+#   APPLICATION FACTORY
+# ================================
 
-app.config["SQLALCHEMY_DATABASE_URI"] = database_url
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+def create_app(config=None):
+    """
+    Build the application. `config` (a dict, or an object / import path for
+    from_object) is applied over the environment defaults before any extension
+    reads it. Nothing here connects to the database: the schema is managed by
+    `flask db upgrade`, or `flask init-db` for an empty database.
+    """
+    load_dotenv()
+    app = Flask(__name__)
+
+    # 🔐 Secret key (required for sessions & login)
+    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
+
+    # 🗄 Database config
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url_from_env()
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Optional read-only copy for listing views (see replica.ReadReplica)
+    app.config["REPLICA_DATABASE_URI"] = database_url_from_env("DATABASE_REPLICA_URL") or None
+
+    app.config["ADMIN_EMAIL"] = os.getenv("ADMIN_EMAIL")
+    app.config["ADMIN_PASSWORD"] = os.getenv("ADMIN_PASSWORD")
+    app.config["RECAPTCHA_SITE_KEY"] = os.getenv("RECAPTCHA_SITE_KEY")
+
+    # 🌐 Reverse proxies in front of the app; 0 trusts no X-Forwarded-* header
+    app.config["PROXY_FIX_X_FOR"] = int(os.getenv("PROXY_FIX_X_FOR", 0))
+    app.config["PROXY_FIX_X_PROTO"] = int(os.getenv("PROXY_FIX_X_PROTO", 0))
+    # Set when clients connect to the app itself, with no proxy in between
+    app.config["DIRECT_CLIENTS"] = os.getenv("DIRECT_CLIENTS", "0") == "1"
+
+    if isinstance(config, Mapping):
+        app.config.update(config)
+    elif config is not None:
+        app.config.from_object(config)
+
+    # request.remote_addr feeds the submission and login rate limits: it must
+    # be the client's address, not the proxy's
+    if app.config["PROXY_FIX_X_FOR"] or app.config["PROXY_FIX_X_PROTO"]:
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app,
+            x_for=app.config["PROXY_FIX_X_FOR"],
+            x_proto=app.config["PROXY_FIX_X_PROTO"]
+        )
 
-ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
-ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
-RECAPTCHA_SITE_KEY = os.getenv("RECAPTCHA_SITE_KEY")
-RECAPTCHA_SECRET_KEY = os.getenv("RECAPTCHA_SECRET_KEY")
+    # Until then every visitor would share the proxy's limit, so per-IP limits stay off
+    app.config["CLIENT_IP_TRUSTED"] = bool(app.config["PROXY_FIX_X_FOR"] or app.config["DIRECT_CLIENTS"])
+    if not app.config["CLIENT_IP_TRUSTED"]:
+        app.logger.warning(
+            "Per-IP submission and login limits are off: set PROXY_FIX_X_FOR to the "
+            "number of proxies in front of the app, or DIRECT_CLIENTS=1 if there are none"
+        )
 
-migrate = Migrate(app, db)
-csrf = CSRFProtect()
-csrf.init_app(app)
-db.init_app(app)
+    migrate.init_app(app, db)
+    server_sessions.init_app(app)
+    csrf.init_app(app)
+    engine_pool.init_app(app)  # before db.init_app, which reads the engine options
+    read_replica.init_app(app)  # likewise for the replica bind
+    db.init_app(app)
+    request_metrics.init_app(app)
+    compression.init_app(app)  # registered after metrics so its time is included
+    with app.app_context():
+        for engine in db.engines.values():
+            engine_pool.attach(engine)
+            request_metrics.attach(engine)
+    login_manager.init_app(app)
+    identity_cache.init_app(app)
+    login_guard.init_app(app)
+    recaptcha.init_app(app)
+    submission_queue.init_app(app)
+    submission_screen.init_app(app)
+    audit_sink.init_app(app)
+    audit_retention.init_app(app)
+    response_cache.init_app(app)
+    dashboard_stats.init_app(app)
+    inquiry_options.init_app(app)
+    static_pages.init_app(app)
+    image_pipeline.init_app(app)
+    assets.init_app(app)
+    sitemap.init_app(app)
+
+    for rule, view, options in _routes:
+        app.add_url_rule(rule, view_func=view, **options)
+    app.register_error_handler(404, page_not_found)
+    app.context_processor(inject_csrf_token)
+
+    app.cli.add_command(export_command)
+    app.cli.add_command(ingest_flush)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(create_admin_command)
+
+    return app
+
+# `gunicorn app:app` and `from app import app` still work: the module-level app
+# is built on first access, so a plain import has no side effects.
+def __getattr__(name):
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ================================
 #   HOME ROUTES
 # ================================
 
 # ---------- LOGIN MANAGER SETUP ----------
-login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = "admin_login"
-
 @login_manager.user_loader
-def load_user(admin_id):
-    return Admin.query.get(int(admin_id))
+def load_user(user_id):
+    # Cached read-only snapshot; see identity.AdminIdentityCache
+    return identity_cache.load(user_id)
 
-@app.context_processor
 def inject_csrf_token():
-    return dict(csrf_token=generate_csrf)
-
-# ✅ Create tables (safe startup: do not fail app import if DB is unreachable)
-with app.app_context():
-    try:
-        db.create_all()
-    except Exception as exc:
-        app.logger.warning("Skipping db.create_all() during startup: %s", exc)
+    return dict(csrf_token=response_cache.csrf_token)
 
 # ---------- HOME ROUTE ----------
-@app.route("/")
-def home():
-    testimonial_reviews = Review.query.filter(
-        Review.rating > 4
+def load_testimonials():
+    # rating == 5 rather than > 4 (ratings are 1-5) so ix_reviews_rating_created_at_id
+    # returns the rows already in order
+    reviews = Review.query.filter(
+        Review.rating == 5
     ).order_by(
         Review.created_at.desc()
     ).limit(6).all()
 
+    # Plain dicts so the fragment can live in a shared cache
+    return [
+        dict(name=r.name, email=r.email, rating=r.rating, message=r.message)
+        for r in reviews
+    ]
+
+@route("/")
+@compression.options(compress=True)  # echoes no request input next to its CSRF token
+@sitemap.page(changefreq="weekly", priority=1.0, template="home.html")
+@response_cache.page("home.html")
+@read_replica.reads
+def home():
+    testimonial_reviews = response_cache.fragment("home:testimonials", load_testimonials)
+
     return render_template(
         "home.html",
         testimonial_reviews=testimonial_reviews
     )
 
-@app.route("/404")
+@route("/404")
+@static_pages.prerendered
 def custom_404_page():
     return render_template("404.html"), 404
 
-@app.errorhandler(404)
 def page_not_found(error):
     return render_template("404.html"), 404
 
 # ---------- PLANS ROUTE ---------
-@app.route("/plans")
+@route("/plans")
+@sitemap.page(changefreq="weekly", priority=0.9, template="plans.html")
+@static_pages.prerendered
 def plans():
     return render_template("plans.html")
 
 # ---------- REVIEW ROUTE ----------
-@app.route("/review", methods=["GET", "POST"])
+@route("/review", methods=["GET", "POST"])
+@sitemap.page(changefreq="monthly", priority=0.6, template="legals/review.html")
 def review_page():
     if request.method == "POST":
-        recaptcha_response = request.form.get("g-recaptcha-response")
-
-        verify_url = "https://www.google.com/recaptcha/api/siteverify"
-
-        response = requests.post(
-            verify_url,
-            data={
-                "secret": RECAPTCHA_SECRET_KEY,
-                "response": recaptcha_response
-            }
+        # Verification overlaps form parsing when a worker pool is configured
+        verification = recaptcha.submit(
+            request.form.get("g-recaptcha-response"),
+            request.remote_addr
         )
 
-        result = response.json()
-
-        if not result.get("success"):
-            flash("Please verify that you are not a robot.", "error")
-            return redirect(url_for("review_page"))
-
         name = request.form.get("name", "").strip()
         email = request.form.get("email", "").strip()
         message = request.form.get("message", "").strip()
         rating = request.form.get("rating", type=int)
 
+        if not verification.result():
+            flash("Please verify that you are not a robot.", "error")
+            return redirect(url_for("review_page"))
+
         if not name or not email or not message or rating is None:
             flash("Please fill all review fields.", "error")
             return redirect(url_for("review_page"))
@@ -131,32 +280,41 @@ def review_page():
             flash("Rating must be between 1 and 5.", "error")
             return redirect(url_for("review_page"))
 
-        new_review = Review(
+        fields = dict(
             name=name,
             email=email,
             rating=rating,
             message=message
         )
 
-        db.session.add(new_review)
-        db.session.commit()
+        # Duplicates are dropped here, without a database write
+        try:
+            digest = submission_screen.screen("review", fields, request.remote_addr)
+            if digest:
+                submission_queue.submit("review", fields)
+                submission_screen.mark_seen(digest)
+        except ValidationError as exc:
+            flash(str(exc), "error")
+            return redirect(url_for("review_page"))
+
         flash("Thank you for your review!", "success")
         return redirect(url_for("review_page"))
 
     return render_template(
         "legals/review.html",
-        recaptcha_site_key=RECAPTCHA_SITE_KEY
+        recaptcha_site_key=current_app.config["RECAPTCHA_SITE_KEY"]
     )
 
 # ---------- INQUIRY FORM ROUTE ----------
-@app.route("/inquiry", methods=["GET", "POST"])
+@route("/inquiry", methods=["GET", "POST"])
+@sitemap.page(changefreq="weekly", priority=0.8, template="user/inquiry.html")
 def inquiry():
     selected_plan = request.args.get("plan", "")
 
     if request.method == "POST":
         addons = request.form.getlist("addons")
 
-        user = User(
+        fields = dict(
             full_name=request.form.get("full_name"),
             email=request.form.get("email"),
             phone=request.form.get("phone"),
@@ -175,35 +333,27 @@ def inquiry():
             references=request.form.get("references")
         )
 
-        db.session.add(user)
-        db.session.commit()
+        try:
+            digest = submission_screen.screen("inquiry", fields, request.remote_addr)
+            if digest:
+                submission_queue.submit("inquiry", fields)
+                submission_screen.mark_seen(digest)
+        except ValidationError as exc:
+            flash(str(exc), "error")
 
         return redirect(url_for("inquiry"))
 
     return render_template("user/inquiry.html", selected_plan=selected_plan)
 
 # ---------- CONTACT ROUTE ----------
-@app.route("/contact", methods=["POST"])
+@route("/contact", methods=["POST"])
 def contact():
 
-    recaptcha_response = request.form.get("g-recaptcha-response")
-
-    verify_url = "https://www.google.com/recaptcha/api/siteverify"
-
-    response = requests.post(
-        verify_url,
-        data={
-            "secret": RECAPTCHA_SECRET_KEY,
-            "response": recaptcha_response
-        }
+    verification = recaptcha.submit(
+        request.form.get("g-recaptcha-response"),
+        request.remote_addr
     )
 
-    result = response.json()
-
-    if not result.get("success"):
-        flash("Please verify that you are not a robot.")
-        return redirect(url_for("home"))
-
     # Process form (store in DB or send email)
 
     name = request.form.get("name")
@@ -212,17 +362,25 @@ def contact():
     subject = request.form.get("subject")
     message = request.form.get("message")
 
-    # Save to database
-    new_message = ContactMessage(
+    if not verification.result():
+        flash("Please verify that you are not a robot.")
+        return redirect(url_for("home"))
+
+    # Save to database (or the write-behind journal)
+    fields = dict(
         name=name,
         email=email,
         phone=phone,
         subject=subject,
         message=message
     )
-
-    db.session.add(new_message)
-    db.session.commit()
+    try:
+        digest = submission_screen.screen("contact", fields, request.remote_addr)
+        if digest:
+            submission_queue.submit("contact", fields)
+            submission_screen.mark_seen(digest)
+    except ValidationError as exc:
+        return jsonify({"status": "error", "message": str(exc)}), 400
 
     return jsonify({"status": "success"})
 
@@ -230,74 +388,106 @@ def contact():
     # return redirect(url_for("home"))
 
 # ---------- PRIVACY POLICY ROUTE ----------
-@app.route("/privacy")
+@route("/privacy")
+@sitemap.page(changefreq="yearly", priority=0.4, template="legals/privacy.html")
+@static_pages.prerendered
 def privacy():
     return render_template("legals/privacy.html")
 
 # ---------- TERMS & CONDITIONS ROUTE ----------
-@app.route("/terms")
+@route("/terms")
+@sitemap.page(changefreq="yearly", priority=0.4, template="legals/terms.html")
+@static_pages.prerendered
 def terms():
     return render_template("legals/terms.html")
 
 # ---------- REFUND & CANCELLATION POLICY ROUTE ----------
-@app.route("/refund_policy")
+@route("/refund_policy")
+@sitemap.page(changefreq="yearly", priority=0.5, template="refund.html")
+@static_pages.prerendered
 def refund_policy():
     return render_template("refund.html")
 
 # ---------- PORTFOLIO ROUTE ----------
-@app.route("/portfolio")
+@route("/portfolio")
+@sitemap.page(changefreq="weekly", priority=0.8, template="portfolio.html")
+@static_pages.prerendered
 def portfolio():
     return render_template("portfolio.html")
 
 # ---------- SEO FILE ROUTES ----------
-@app.route("/robots.txt")
+def send_seo_file(filename, mimetype):
+    # Content-hash ETag survives redeploys, unlike the default mtime-based one
+    static_folder = current_app.static_folder
+    return send_from_directory(
+        static_folder,
+        filename,
+        mimetype=mimetype,
+        etag=assets.file_etag(os.path.join(static_folder, filename)),
+        max_age=86400
+    )
+
+@route("/robots.txt")
 def robots_txt():
-    return send_from_directory(app.static_folder, "robots.txt", mimetype="text/plain")
+    return send_seo_file("robots.txt", "text/plain")
 
-@app.route("/sitemap.xml")
+@route("/sitemap.xml")
 def sitemap_xml():
-    return send_from_directory(app.static_folder, "sitemap.xml", mimetype="application/xml")
+    return sitemap.response()
+
+@route("/sitemap-<int:number>.xml")
+def sitemap_shard(number):
+    return sitemap.response(f"sitemap-{number}.xml")
 
 # ================================
 #   ADMIN ROUTES
 # ================================
 
 def create_admin():
-    with app.app_context():
-        # check if admin already exists
-        admin = Admin.query.filter_by(email=ADMIN_EMAIL).first()
-
-        if not admin:
-            admin = Admin(
-                name="Md. Adeen Hussain",
-                email=ADMIN_EMAIL,
-                phone="9674667587",
-                gender="Male",
-                password_hash=generate_password_hash(ADMIN_PASSWORD),
-                email_verified=True,
-                phone_verified=True,
-                is_admin=True
-            )
-
-            db.session.add(admin)
-            db.session.commit()
-
-            print("✅ Admin user created")
-        else:
-             # sync password from env (safe)
-            admin.password_hash = generate_password_hash(ADMIN_PASSWORD)
-            db.session.commit()
-            print("ℹ️ Admin already exists")
+    admin_email = current_app.config["ADMIN_EMAIL"]
+    admin_password = current_app.config["ADMIN_PASSWORD"]
+
+    # check if admin already exists
+    admin = Admin.query.filter_by(email=admin_email).first()
+
+    if not admin:
+        admin = Admin(
+            name="Md. Adeen Hussain",
+            email=admin_email,
+            phone="9674667587",
+            gender="Male",
+            password_hash=login_guard.hash_password(admin_password),
+            email_verified=True,
+            phone_verified=True,
+            is_admin=True
+        )
+
+        db.session.add(admin)
+        db.session.commit()
+
+        print("✅ Admin user created")
+    elif check_password_hash(admin.password_hash, admin_password):
+        # Hashing is deliberately slow; don't redo it for an unchanged password
+        print("ℹ️ Admin already exists, password unchanged")
+    else:
+         # sync password from env (safe)
+        admin.password_hash = login_guard.hash_password(admin_password)
+        db.session.commit()
+        print("ℹ️ Admin already exists, password updated")
+
+@click.command("create-admin")
+@with_appcontext
+def create_admin_command():
+    """Create the admin from ADMIN_EMAIL / ADMIN_PASSWORD, or sync its password."""
+    create_admin()
 
 def log_action(action):
     if current_user.is_authenticated:
-        log = AuditLog(
+        audit_sink.record(
             admin_email=current_user.email,
             action=action,
             ip_address=request.remote_addr
         )
-        db.session.add(log)
-        db.session.commit()
 
 def admin_required(f):
     @wraps(f)
@@ -310,15 +500,26 @@ def admin_required(f):
     return decorated
 
 # ---------- ADMIN LOGIN ----------
-@app.route("/admin/login", methods=["GET", "POST"])
+@route("/admin/login", methods=["GET", "POST"])
 def admin_login():
     if request.method == "POST":
         email = request.form.get("email")
         password = request.form.get("password")
 
+        # Throttled before any hashing happens
+        if not login_guard.allow(request.remote_addr, email):
+            flash("Too many login attempts. Please wait a minute and try again.", "error")
+            return render_template("admin/login.html"), 429
+
         admin = Admin.query.filter_by(email=email).first()
 
-        if admin and admin.check_password(password):
+        try:
+            valid = admin is not None and login_guard.verify(admin.password_hash, password)
+        except LoginBusy:
+            flash("The server is busy. Please try again in a moment.", "error")
+            return render_template("admin/login.html"), 503
+
+        if valid:
             login_user(admin)
             log_action("Admin logged in")
             return redirect(url_for("admin_dashboard"))
@@ -328,7 +529,7 @@ def admin_login():
     return render_template("admin/login.html")
 
 # ---------- ADMIN CHANGE CREDENTIAL ----------
-@app.route("/admin/change-credentials", methods=["GET", "POST"])
+@route("/admin/change-credentials", methods=["GET", "POST"])
 @login_required
 def change_admin_credentials():
     if not current_user.is_admin:
@@ -338,13 +539,17 @@ def change_admin_credentials():
         new_email = request.form.get("email")
         new_password = request.form.get("password")
 
+        # current_user is a read-only snapshot; update the row itself
+        admin = db.session.get(Admin, current_user.id)
+
         if new_email:
-            current_user.email = new_email
+            admin.email = new_email
 
         if new_password:
-            current_user.password_hash = generate_password_hash(new_password)
+            admin.password_hash = login_guard.hash_password(new_password)
 
         db.session.commit()
+        identity_cache.invalidate(admin.id)
         logout_user()
         flash("Credentials updated. Please login again.", "success")
         return redirect(url_for("admin_login"))
@@ -352,63 +557,60 @@ def change_admin_credentials():
     return render_template("admin/change_credentials.html")
 
 # ---------- ADMIN DASHBOARD ----------
-@app.route("/admin/dashboard")
+@route("/admin/dashboard")
 @login_required
+@read_replica.reads
 def admin_dashboard():
-    inquiries_count = User.query.count()
+    # Summary-table reads only; see stats.DashboardStats
+    stats = dashboard_stats.snapshot()
 
     return render_template(
         "admin/dashboard.html",
-        inquiries_count=inquiries_count
+        inquiries_count=stats["inquiries_total"],
+        stats=stats
     )
 
 # ---------- ADMIN INQUIRY ----------
-@app.route("/admin/inquiries")
+@route("/admin/inquiries")
 @login_required
+@read_replica.reads
 def admin_inquiries():
     # 🔍 Search & filter inputs
     search = request.args.get("search", "")
     status = request.args.get("status", "")
+    options = option_filters(request.args)
 
-    # 📄 Pagination inputs
-    page = request.args.get("page", 1, type=int)
+    # 📄 Keyset cursors (opaque created_at/id pairs)
+    after = request.args.get("after")
+    before = request.args.get("before")
     per_page = 10
 
-    query = User.query
+    query = inquiry_query(search, status, options)
 
-    # 🔍 Search by name or email
-    if search:
-        query = query.filter(
-            (User.full_name.ilike(f"%{search}%")) |
-            (User.email.ilike(f"%{search}%"))
-        )
+    # 📄 Newest first, one index range scan per page
+    page = keyset_paginate(query, User, per_page, after=after, before=before)
 
-    # 🟢 Filter by contacted status
-    if status == "contacted":
-        query = query.filter(User.is_contacted == True)
-    elif status == "pending":
-        query = query.filter(User.is_contacted == False)
-
-    # 📑 Order newest first
-    query = query.order_by(User.created_at.desc())
-
-    # 📄 Apply pagination
-    pagination = query.paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
+    total, total_is_estimate = approximate_count(
+        query,
+        User,
+        cache_key=f"inquiries:{search}:{status}:{':'.join(options.values())}",
+        filtered=bool(search or status or any(options.values()))
     )
 
     # 🎯 Render page
     return render_template(
         "admin/inquiries.html",
-        inquiries=pagination.items,
-        pagination=pagination,
+        inquiries=page.items,
+        page=page,
+        total=total,
+        total_is_estimate=total_is_estimate,
         search=search,
-        status=status
+        status=status,
+        options=options,
+        option_choices={field: inquiry_options.choices(field) for field in OPTION_FIELDS}
     )
 
-@app.route("/admin/inquiry/<int:id>")
+@route("/admin/inquiry/<int:id>")
 @login_required
 def admin_inquiry_detail(id):
     inquiry = User.query.get_or_404(id)
@@ -418,11 +620,12 @@ def admin_inquiry_detail(id):
         inquiry=inquiry
     )
 
-@app.route("/admin/inquiry/<int:id>/toggle", methods=["POST"])
+@route("/admin/inquiry/<int:id>/toggle", methods=["POST"])
 @login_required
 def toggle_inquiry_status(id):
     inquiry = User.query.get_or_404(id)
     inquiry.is_contacted = not inquiry.is_contacted
+    dashboard_stats.inquiry_toggled(inquiry)
     db.session.commit()
 
     status = "Contacted" if inquiry.is_contacted else "Pending"
@@ -430,57 +633,311 @@ def toggle_inquiry_status(id):
     return redirect(request.referrer or url_for("admin_inquiries"))
     # return jsonify({"success": True})
 
-@app.route("/admin/inquiry/<int:id>/delete", methods=["POST"])
+@route("/admin/inquiry/<int:id>/delete", methods=["POST"])
 @login_required
 def delete_inquiry(id):
     inquiry = User.query.get_or_404(id)
     db.session.delete(inquiry)
+    dashboard_stats.inquiry_deleted(inquiry)
     db.session.commit()
     log_action(f"Deleted inquiry #{id}")
     return redirect(url_for("admin_inquiries"))
 
+BULK_ACTIONS = ("contacted", "pending", "toggle", "delete")
+BULK_MAX_IDS = 5000
+
+@route("/admin/inquiries/bulk", methods=["POST"])
+@login_required
+def bulk_inquiries():
+    # JSON from the listing's select bar, or a plain form post
+    data = request.get_json(silent=True)
+    if data is None:
+        data = dict(request.form.items(), ids=request.form.getlist("ids"))
+
+    action = data.get("action")
+    if action not in BULK_ACTIONS:
+        return jsonify({"status": "error", "message": f"action must be one of: {', '.join(BULK_ACTIONS)}"}), 400
+
+    # Explicit ids, or every row matching the listing's search/status filters
+    if data.get("ids"):
+        ids = data["ids"]
+        # A list of numbers (JSON) or digit strings (form); {"ids": "123"} is not ids 1, 2, 3
+        if not isinstance(ids, list) or not all(
+            type(i) is int or (isinstance(i, str) and i.isascii() and i.isdigit()) for i in ids
+        ):
+            return jsonify({"status": "error", "message": "ids must be a list of integers"}), 400
+        ids = sorted({int(i) for i in ids})
+        if len(ids) > BULK_MAX_IDS:
+            return jsonify({"status": "error", "message": f"At most {BULK_MAX_IDS} ids per request"}), 400
+        query = User.query.filter(User.id.in_(ids))
+        scope = f"{len(ids)} selected"
+    elif data.get("scope") == "filter":
+        search, status = data.get("search") or "", data.get("status") or ""
+        options = option_filters(data)
+        query = inquiry_query(search, status, options)
+        scope = f"filter search={search!r} status={status or 'all'}" + "".join(
+            f" {param}={value!r}" for param, value in options.items() if value
+        )
+    else:
+        return jsonify({"status": "error", "message": "Pass ids, or scope=filter with search/status"}), 400
+
+    # Set-based statements; counter deltas come from the rowcounts or one
+    # grouped read, so no inquiry is loaded into the session
+    if action == "delete":
+        day = func.date(User.created_at)
+        groups = query.with_entities(User.is_contacted, day, func.count(User.id)) \
+            .group_by(User.is_contacted, day).order_by(None).all()
+        # inquiry_options rows go with them via ON DELETE CASCADE
+        affected = query.order_by(None).delete(synchronize_session=False)
+        dashboard_stats.inquiries_deleted(groups)
+        summary = f"Bulk deleted {affected} inquiries ({scope})"
+    elif action == "toggle":
+        contacted = query.with_entities(func.count(User.id)).filter(User.is_contacted == True).order_by(None).scalar()
+        affected = query.order_by(None).update(
+            {User.is_contacted: ~User.is_contacted}, synchronize_session=False
+        )
+        dashboard_stats.add(inquiries_contacted=affected - 2 * contacted)
+        summary = f"Bulk toggled {affected} inquiries ({scope})"
+    else:
+        target = action == "contacted"
+        # Only rows that actually change, so the rowcount is the counter delta
+        affected = query.filter(User.is_contacted == (not target)).order_by(None).update(
+            {User.is_contacted: target}, synchronize_session=False
+        )
+        dashboard_stats.add(inquiries_contacted=affected if target else -affected)
+        summary = f"Bulk marked {affected} inquiries as {'Contacted' if target else 'Pending'} ({scope})"
+
+    db.session.commit()
+    log_action(summary[:255])
+    return jsonify({"status": "success", "action": action, "affected": affected})
+
 # ---------- ADMIN CONTACT MESSAGES ----------
-@app.route("/admin/contact-messages")
+LISTING_PER_PAGE = 25
+
+def contact_messages_page():
+    is_read = request.args.get("is_read", "")
+
+    # Summary columns only; the message body loads on the detail page
+    query = ContactMessage.query.options(load_only(
+        ContactMessage.id,
+        ContactMessage.name,
+        ContactMessage.email,
+        ContactMessage.phone,
+        ContactMessage.subject,
+        ContactMessage.created_at,
+        ContactMessage.is_read
+    ))
+
+    if is_read == "read":
+        query = query.filter(ContactMessage.is_read == True)
+    elif is_read == "unread":
+        query = query.filter(ContactMessage.is_read == False)
+
+    page = keyset_paginate(query, ContactMessage, LISTING_PER_PAGE, after=request.args.get("after"))
+    return page, is_read
+
+@route("/admin/contact-messages")
 @admin_required
+@read_replica.reads
 def admin_contact_messages():
-
-    messages = ContactMessage.query.order_by(
-        ContactMessage.created_at.desc()
-    ).all()
+    page, is_read = contact_messages_page()
 
     return render_template(
         "admin/contact_messages.html",
-        messages=messages
+        messages=page.items,
+        page=page,
+        is_read=is_read
     )
 
+@route("/admin/contact-messages/feed")
+@admin_required
+@read_replica.reads
+def admin_contact_messages_feed():
+    page, is_read = contact_messages_page()
+
+    return jsonify({
+        "items": [
+            {
+                "id": msg.id,
+                "name": msg.name,
+                "email": msg.email,
+                "phone": msg.phone,
+                "subject": msg.subject,
+                "is_read": msg.is_read,
+                "created_at": msg.created_at.strftime("%d %b %Y") if msg.created_at else "",
+                "url": url_for("admin_contact_message_detail", id=msg.id)
+            }
+            for msg in page.items
+        ],
+        "next": url_for("admin_contact_messages_feed", after=page.next_cursor, is_read=is_read) if page.has_next else None
+    })
+
+@route("/admin/contact-messages/<int:id>")
+@admin_required
+def admin_contact_message_detail(id):
+    message = ContactMessage.query.get_or_404(id)
+
+    if not message.is_read:
+        message.is_read = True
+        dashboard_stats.contact_read()
+        db.session.commit()
+
+    return render_template("admin/contact_message_detail.html", message=message)
+
 # ---------- ADMIN REVIEWS ----------
-@app.route("/admin/reviews")
+REVIEW_PREVIEW_LENGTH = 200
+
+def reviews_page():
+    rating = request.args.get("rating", type=int)
+
+    query = Review.query.options(
+        load_only(Review.id, Review.name, Review.email, Review.rating, Review.created_at),
+        with_expression(Review.message_preview, func.substr(Review.message, 1, REVIEW_PREVIEW_LENGTH))
+    )
+
+    if rating:
+        query = query.filter(Review.rating == rating)
+
+    page = keyset_paginate(query, Review, LISTING_PER_PAGE, after=request.args.get("after"))
+    return page, rating
+
+@route("/admin/reviews")
 @admin_required
+@read_replica.reads
 def admin_reviews():
-    reviews = Review.query.order_by(Review.created_at.desc()).all()
-    return render_template("admin/reviews.html", reviews=reviews)
+    page, rating = reviews_page()
+    return render_template("admin/reviews.html", reviews=page.items, page=page, rating=rating)
+
+@route("/admin/reviews/feed")
+@admin_required
+@read_replica.reads
+def admin_reviews_feed():
+    page, rating = reviews_page()
+
+    return jsonify({
+        "items": [
+            {
+                "id": review.id,
+                "name": review.name,
+                "email": review.email,
+                "rating": review.rating,
+                "preview": review.message_preview,
+                "created_at": review.created_at.strftime("%d %b %Y, %I:%M %p") if review.created_at else "",
+                "url": url_for("admin_review_detail", id=review.id)
+            }
+            for review in page.items
+        ],
+        "next": url_for("admin_reviews_feed", after=page.next_cursor, rating=rating) if page.has_next else None
+    })
+
+@route("/admin/reviews/<int:id>")
+@admin_required
+def admin_review_detail(id):
+    review = Review.query.get_or_404(id)
+    return render_template("admin/review_detail.html", review=review)
 
 # ---------- ADMIN AUDIT LOG ROUTE ----------
-@app.route("/admin/audit-logs")
+@route("/admin/audit-logs")
 @login_required
+@read_replica.reads
 def admin_audit_logs():
+    # Show entries still sitting in the buffer too (read back from the primary)
+    if audit_sink.flush():
+        read_replica.primary()
     logs = AuditLog.query.order_by(AuditLog.created_at.desc()).limit(200).all()
     return render_template("admin/audit_logs.html", logs=logs)
 
+# ---------- ADMIN EXPORTS ----------
+@route("/admin/export/<kind>.<fmt>")
+@login_required
+def admin_export(kind, fmt):
+    if kind not in EXPORTS or fmt not in EXPORT_FORMATS:
+        abort(404)
+
+    log_action(f"Exported {kind} as {fmt}")
+    return export_response(
+        kind,
+        fmt,
+        search=request.args.get("search", ""),
+        status=request.args.get("status", ""),
+        options=option_filters(request.args)
+    )
+
+# ---------- ADMIN WRITE-BEHIND STATUS ----------
+@route("/admin/ingest-status")
+@login_required
+def admin_ingest_status():
+    return jsonify(dict(submission_queue.stats(), screening=submission_screen.stats()))
+
+@click.command("ingest-flush")
+@with_appcontext
+def ingest_flush():
+    """Drain the write-behind journal into the database."""
+    if not submission_queue.enabled:
+        click.echo("Write-behind ingestion is disabled (INGEST_ENABLED=0).")
+        return
+
+    total = 0
+    while True:
+        flushed = submission_queue.flush()
+        total += flushed
+        if flushed < submission_queue.batch_size:
+            break
+    click.echo(f"Flushed {total} submissions, {submission_queue.depth()} still queued.")
+
+# ---------- ADMIN CACHE STATS ----------
+@route("/admin/cache-stats")
+@login_required
+def admin_cache_stats():
+    return jsonify(response_cache.stats())
+
+# ---------- DATABASE POOL / HEALTH ----------
+@route("/admin/db-pool")
+@login_required
+def admin_db_pool():
+    return jsonify(dict(engine_pool.metrics(), replica=read_replica.stats()))
+
+@route("/healthz")
+@compression.options(compress=False, etag=False)
+def healthz():
+    ok, latency_ms = engine_pool.health()
+    return jsonify({"status": "ok" if ok else "unavailable", "db_ms": latency_ms}), 200 if ok else 503
+
+# ---------- METRICS ----------
+@route("/admin/metrics")
+@admin_required
+def admin_metrics():
+    return render_template("admin/metrics.html", endpoints=request_metrics.summary())
+
+@route("/metrics")
+def prometheus_metrics():
+    # Bearer METRICS_TOKEN; 404 rather than 401 so the endpoint isn't advertised
+    if not request_metrics.authorized():
+        abort(404)
+    return current_app.response_class(request_metrics.prometheus(), mimetype="text/plain; version=0.0.4")
+
 # ---------- ADMIN LOGOUT ----------
-@app.route("/admin/logout")
+@route("/admin/logout")
 @login_required
 def admin_logout():
     log_action("Admin logged out")
     logout_user()
     return redirect(url_for("admin_login"))
 
+# ---------- SCHEMA ----------
+@click.command("init-db")
+@with_appcontext
+def init_db_command():
+    """Create the schema in an empty database and stamp it at the latest migration."""
+    if inspect(db.engine).get_table_names():
+        raise click.ClickException("Database already has tables; run `flask db upgrade` instead.")
+
+    # The primary only; a replica bind is read-only and gets the schema by replication
+    db.create_all(bind_key=None)
+    stamp()
+    click.echo("Schema created and stamped at the latest migration.")
+
 # ---------------- RUN THE APP ----------------
 if __name__ == "__main__":    #---------------- Always be at the end of the file ----------------
-    with app.app_context():
-        try:
-            db.create_all()
-        except Exception as exc:
-            app.logger.warning("Skipping db.create_all() before app.run(): %s", exc)
-        # create_admin()
-    app.run(debug=True)
+    # Apply migrations first: `flask db upgrade` (or `flask init-db` on an empty database)
+    create_app().run(debug=True)
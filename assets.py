@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+
+import click
+from flask import current_app, request
+
+try:
+    import rcssmin
+except ImportError:  # optional: falls back to the conservative minifier below
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+ASSET_DIRS = ("css", "js", "images")
+ONE_YEAR = 31536000
+
+
+# ---------- MINIFIERS ----------
+def minify_css(text):
+    if rcssmin is not None:
+        return rcssmin.cssmin(text)
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+    return text.replace(";}", "}").strip()
+
+
+def minify_js(text):
+    if rjsmin is not None:
+        return rjsmin.jsmin(text)
+    # Without rjsmin only drop whole-line comments and indentation; anything
+    # cleverer needs a real tokenizer.
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//")) + "\n"
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+class _AssetsState:
+    """One app's parsed manifest and file ETags, kept in app.extensions["assets"]."""
+
+    def __init__(self):
+        self.manifest = {}
+        self.mtime = None
+        self.etags = {}
+        self.lock = threading.Lock()
+
+
+class AssetManifest:
+    """
+    Content-hashed copies of static assets with far-future caching.
+
+    `flask assets build` copies css/, js/ and images/ into ASSETS_DIST_DIR under
+    names like css/main.3f2a1b9c.css and writes a manifest. url_for('static', ...)
+    then resolves logical names through it, and hashed files are served as
+    immutable for a year. Without a manifest everything behaves as before.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("ASSETS_DIST_DIR", "dist")
+        app.config.setdefault("ASSETS_MINIFY", os.getenv("ASSETS_MINIFY", "0") == "1")
+        # Paths under static/ whose names are already content-hashed
+        app.config.setdefault("ASSETS_IMMUTABLE_PREFIXES", ["dist/", "images/optimized/"])
+
+        app.url_defaults(self.hashed_static_url)
+        app.after_request(self.add_cache_headers)
+        app.extensions["assets"] = _AssetsState()
+
+        @app.cli.group("assets")
+        def assets_group():
+            """Fingerprinted static assets."""
+
+        @assets_group.command("build")
+        @click.option("--minify/--no-minify", default=None, help="Minify CSS/JS (default: ASSETS_MINIFY).")
+        def build_command(minify):
+            """Copy static assets to content-hashed names and write the manifest."""
+            if minify is None:
+                minify = app.config["ASSETS_MINIFY"]
+            manifest = self.build(minify=minify)
+            click.echo(f"Fingerprinted {len(manifest)} assets into static/{app.config['ASSETS_DIST_DIR']}/")
+
+    @property
+    def dist_dir(self):
+        return os.path.join(current_app.static_folder, current_app.config["ASSETS_DIST_DIR"])
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.dist_dir, "manifest.json")
+
+    # ---------- BUILD ----------
+    def build(self, minify=False):
+        static = current_app.static_folder
+        dist = current_app.config["ASSETS_DIST_DIR"]
+        skip = [os.path.join(static, p.rstrip("/")) for p in current_app.config["ASSETS_IMMUTABLE_PREFIXES"]]
+
+        if os.path.isdir(self.dist_dir):
+            shutil.rmtree(self.dist_dir)
+        manifest = {}
+
+        for top in ASSET_DIRS:
+            for root, dirs, files in os.walk(os.path.join(static, top)):
+                dirs[:] = [d for d in dirs if os.path.join(root, d) not in skip]
+                for name in sorted(files):
+                    if name.startswith("."):
+                        continue
+                    source = os.path.join(root, name)
+                    logical = os.path.relpath(source, static).replace(os.sep, "/")
+
+                    with open(source, "rb") as fh:
+                        data = fh.read()
+                    stem, ext = os.path.splitext(logical)
+                    if minify and ext in MINIFIERS:
+                        data = MINIFIERS[ext](data.decode("utf-8")).encode("utf-8")
+
+                    digest = hashlib.sha256(data).hexdigest()[:8]
+                    hashed = f"{stem}.{digest}{ext}"
+                    target = os.path.join(self.dist_dir, hashed)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with open(target, "wb") as fh:
+                        fh.write(data)
+
+                    manifest[logical] = f"{dist}/{hashed}"
+
+        with open(self.manifest_path, "w") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+        current_app.extensions["assets"].mtime = None
+        return manifest
+
+    # ---------- RUNTIME ----------
+    def load_manifest(self):
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime
+        except OSError:
+            return {}
+
+        state = current_app.extensions["assets"]
+        if mtime != state.mtime:
+            with state.lock:
+                with open(self.manifest_path) as fh:
+                    state.manifest = json.load(fh)
+                state.mtime = mtime
+        return state.manifest
+
+    def hashed_static_url(self, endpoint, values):
+        if endpoint == "static" and "filename" in values:
+            values["filename"] = self.load_manifest().get(values["filename"], values["filename"])
+
+    def add_cache_headers(self, response):
+        if request.endpoint != "static" or response.status_code not in (200, 304):
+            return response
+
+        filename = (request.view_args or {}).get("filename", "")
+        if filename.startswith(tuple(current_app.config["ASSETS_IMMUTABLE_PREFIXES"])):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = ONE_YEAR
+            response.cache_control.immutable = True
+        return response
+
+    def file_etag(self, path):
+        """Content-hash ETag for a file, recomputed only when it changes on disk."""
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        etags = current_app.extensions["assets"].etags
+        etag = etags.get(key)
+        if etag is None:
+            with open(path, "rb") as fh:
+                etag = hashlib.sha256(fh.read()).hexdigest()[:32]
+            etags[key] = etag
+        return etag
@@ -0,0 +1,232 @@
+import atexit
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete, insert, select
+
+from background import PeriodicWorker
+from model import db, AuditLog, AuditLogArchive
+
+ARCHIVE_COLUMNS = ("id", "admin_email", "action", "ip_address", "created_at")
+
+
+class AuditUnavailable(RuntimeError):
+    """The buffer is full and the database refuses writes; the entry was not recorded."""
+
+
+class _AuditSinkState:
+    """The buffer of one app (app.extensions["audit"]); its flusher writes to that app's database."""
+
+    def __init__(self, app):
+        self.app = app
+        self.mode = app.config["AUDIT_MODE"]
+        self.batch_size = app.config["AUDIT_BATCH_SIZE"]
+        self.buffer_size = app.config["AUDIT_BUFFER_SIZE"]
+        self.flusher = PeriodicWorker(app, "audit-flusher", app.config["AUDIT_FLUSH_INTERVAL"], self.flush)
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def record(self, admin_email, action, ip_address):
+        entry = dict(
+            admin_email=admin_email,
+            action=action,
+            ip_address=ip_address,
+            created_at=datetime.utcnow()
+        )
+
+        if self.mode == "sync":
+            db.session.add(AuditLog(**entry))
+            db.session.commit()
+            return
+
+        self._ensure_started()
+        if len(self._buffer) >= self.buffer_size:
+            # A failed flush left it full: try once more, then refuse rather than drop
+            self.flush()
+        with self._lock:
+            if len(self._buffer) >= self.buffer_size:
+                self.app.logger.error("Audit buffer full (%d entries); refusing %r", len(self._buffer), action)
+                raise AuditUnavailable("Audit log unavailable")
+            self._buffer.append(entry)
+            size = len(self._buffer)
+
+        if size >= self.buffer_size:
+            self.flush()
+        elif size >= self.batch_size:
+            self.flusher.wake()
+
+    def pending(self):
+        return len(self._buffer)
+
+    def flush(self):
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+        if not entries:
+            return 0
+
+        try:
+            with self.app.app_context(), db.engine.begin() as conn:
+                conn.execute(insert(AuditLog), entries)
+        except Exception:
+            self.app.logger.exception("Audit flush failed; requeueing %d entries", len(entries))
+            with self._lock:
+                # Oldest first, all kept: record() refuses new entries once full
+                self._buffer = entries + self._buffer
+            return 0
+
+        return len(entries)
+
+    # ---------- FLUSHER ----------
+    def _ensure_started(self):
+        if not self.flusher.running:
+            self.flusher.start()
+            atexit.register(self.flush)
+
+
+class AuditSink:
+    """
+    Buffers audit entries in memory and writes them with one multi-row INSERT.
+
+    The buffer is flushed every AUDIT_FLUSH_INTERVAL seconds, as soon as
+    AUDIT_BATCH_SIZE entries are waiting, and at process exit. When it is full
+    (AUDIT_BUFFER_SIZE) the caller flushes inline. A failed flush keeps every
+    entry; while the database stays down and the buffer is full, record()
+    raises AuditUnavailable instead of dropping anything, as a failed commit
+    would in AUDIT_MODE=sync (the old add+commit per entry).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("AUDIT_MODE", os.getenv("AUDIT_MODE", "buffered"))
+        app.config.setdefault("AUDIT_BATCH_SIZE", int(os.getenv("AUDIT_BATCH_SIZE", 50)))
+        app.config.setdefault("AUDIT_BUFFER_SIZE", int(os.getenv("AUDIT_BUFFER_SIZE", 1000)))
+        app.config.setdefault("AUDIT_FLUSH_INTERVAL", float(os.getenv("AUDIT_FLUSH_INTERVAL", 2.0)))
+
+        app.extensions["audit"] = _AuditSinkState(app)
+
+    @property
+    def _state(self):
+        return current_app.extensions["audit"]
+
+    def record(self, admin_email, action, ip_address):
+        self._state.record(admin_email, action, ip_address)
+
+    def pending(self):
+        return self._state.pending()
+
+    def flush(self):
+        return self._state.flush()
+
+
+# ---------- RETENTION ----------
+class AuditRetention:
+    """
+    Moves audit entries older than AUDIT_RETENTION_DAYS out of audit_logs.
+
+    Batches of AUDIT_ARCHIVE_BATCH rows, oldest first, are copied to the
+    audit_logs_archive table (AUDIT_ARCHIVE=table) or appended to monthly
+    gzip JSONL files under AUDIT_ARCHIVE_DIR (AUDIT_ARCHIVE=jsonl), then
+    deleted, one transaction per batch. A file batch written just before a
+    crash is written again on the next run, so files are at-least-once.
+    Run `flask audit archive` from cron, or set AUDIT_RETENTION_INTERVAL.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("AUDIT_RETENTION_DAYS", int(os.getenv("AUDIT_RETENTION_DAYS", 90)))
+        app.config.setdefault("AUDIT_ARCHIVE", os.getenv("AUDIT_ARCHIVE", "table"))
+        app.config.setdefault("AUDIT_ARCHIVE_DIR", os.getenv("AUDIT_ARCHIVE_DIR", os.path.join(app.instance_path, "audit-archive")))
+        app.config.setdefault("AUDIT_ARCHIVE_BATCH", int(os.getenv("AUDIT_ARCHIVE_BATCH", 5000)))
+        # Seconds between background runs; 0 leaves it to cron
+        app.config.setdefault("AUDIT_RETENTION_INTERVAL", int(os.getenv("AUDIT_RETENTION_INTERVAL", 0)))
+
+        if app.config["AUDIT_ARCHIVE"] not in ("table", "jsonl"):
+            raise ValueError(f"Unknown AUDIT_ARCHIVE: {app.config['AUDIT_ARCHIVE']!r}")
+
+        worker = app.extensions["audit_retention"] = PeriodicWorker(
+            app, "audit-retention", app.config["AUDIT_RETENTION_INTERVAL"], self.archive
+        )
+        if app.config["AUDIT_RETENTION_INTERVAL"] > 0:
+            app.before_request(worker.start)
+
+        @app.cli.group("audit")
+        def audit_group():
+            """Audit log retention."""
+
+        @audit_group.command("archive")
+        @click.option("--days", type=int, default=None, help="Keep this many days (default AUDIT_RETENTION_DAYS).")
+        @click.option("--batch-size", type=int, default=None, help="Rows per transaction.")
+        @with_appcontext
+        def archive_command(days, batch_size):
+            """Move old audit entries to the archive."""
+            moved = self.archive(days, batch_size, progress=lambda done: click.echo(f"{done} entries archived"))
+            click.echo(f"Archived {moved} audit entries ({current_app.config['AUDIT_ARCHIVE']}).")
+
+    # ---------- ARCHIVE ----------
+    def cutoff(self, days=None):
+        days = current_app.config["AUDIT_RETENTION_DAYS"] if days is None else days
+        return datetime.utcnow() - timedelta(days=days)
+
+    def archive(self, days=None, batch_size=None, progress=None):
+        cutoff = self.cutoff(days)
+        batch_size = batch_size or current_app.config["AUDIT_ARCHIVE_BATCH"]
+        columns = [getattr(AuditLog, name) for name in ARCHIVE_COLUMNS]
+        moved = 0
+
+        while True:
+            # Oldest first along ix_audit_logs_created_at_id; SKIP LOCKED lets
+            # two runners on PostgreSQL take different batches
+            rows = [dict(row._mapping) for row in db.session.execute(
+                select(*columns)
+                .where(AuditLog.created_at < cutoff)
+                .order_by(AuditLog.created_at, AuditLog.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()]
+            if not rows:
+                db.session.rollback()
+                break
+
+            if current_app.config["AUDIT_ARCHIVE"] == "table":
+                db.session.execute(insert(AuditLogArchive), rows)
+            else:
+                self._write_files(rows)
+            db.session.execute(delete(AuditLog).where(AuditLog.id.in_([row["id"] for row in rows])))
+            db.session.commit()
+
+            moved += len(rows)
+            if progress:
+                progress(moved)
+            if len(rows) < batch_size:
+                break
+
+        return moved
+
+    def _write_files(self, rows):
+        directory = current_app.config["AUDIT_ARCHIVE_DIR"]
+        os.makedirs(directory, exist_ok=True)
+
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(f"{row['created_at']:%Y-%m}", []).append(row)
+
+        for month, entries in by_month.items():
+            lines = "".join(json.dumps(entry, default=str) + "\n" for entry in entries)
+            # Appending a gzip member per batch keeps each file one valid .gz stream
+            with open(os.path.join(directory, f"audit-{month}.jsonl.gz"), "ab") as fh:
+                fh.write(gzip.compress(lines.encode("utf-8")))
+                fh.flush()
+                os.fsync(fh.fileno())
+
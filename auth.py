@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class LoginBusy(RuntimeError):
+    """Every hashing slot is taken; the attempt is refused rather than queued."""
+
+
+# ---------- TOKEN BUCKETS ----------
+class MemoryBuckets:
+    """Token buckets in process memory, bounded to max_keys most recent keys."""
+
+    def __init__(self, capacity, rate, max_keys=10000):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed
+
+
+class RedisBuckets:
+    """
+    The same buckets in Redis, shared by every worker. Needs the optional
+    `redis` package.
+    """
+
+    SCRIPT = """
+        local capacity = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + (now - updated) * rate)
+        local allowed = 0
+        if tokens >= 1 then
+            tokens = tokens - 1
+            allowed = 1
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+        return allowed
+    """
+
+    def __init__(self, url, capacity, rate, prefix="sw-login:"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("LOGIN_RATE_URL is set but the redis package is not installed") from exc
+
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(self.SCRIPT)
+        self.capacity = capacity
+        self.rate = rate
+        self.prefix = prefix
+
+    def take(self, key):
+        return bool(self.script(keys=[self.prefix + key], args=[self.capacity, self.rate, time.time()]))
+
+
+# ---------- LOGIN GUARD ----------
+class _LoginGuardState:
+    """One app's buckets, hashing pool and counters, kept in app.extensions["login_guard"]."""
+
+    def __init__(self, buckets, ip_limit, workers, queue, hash_method):
+        self.buckets = buckets
+        self.ip_limit = ip_limit
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="login-hash")
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.hash_method = hash_method
+        self.throttled = 0
+        self.busy = 0
+
+
+class LoginGuard:
+    """
+    Throttling and password hashing for admin logins.
+
+    allow() spends one token from the attempt's IP bucket and one from its
+    email bucket; a refused attempt never reaches the hash. Verification runs
+    on LOGIN_HASH_WORKERS threads (hashlib releases the GIL while hashing),
+    with at most LOGIN_HASH_QUEUE more waiting; beyond that verify() raises
+    LoginBusy instead of piling more CPU work onto the worker.
+
+    The IP is request.remote_addr, so the IP bucket is only used when
+    CLIENT_IP_TRUSTED is set (PROXY_FIX_X_FOR or DIRECT_CLIENTS, see
+    create_app); otherwise every attempt would share the proxy's bucket and
+    a few failures would lock all admins out.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("LOGIN_RATE_BURST", int(os.getenv("LOGIN_RATE_BURST", 5)))
+        app.config.setdefault("LOGIN_RATE_PER_MINUTE", float(os.getenv("LOGIN_RATE_PER_MINUTE", 5)))
+        app.config.setdefault("LOGIN_RATE_URL", os.getenv("LOGIN_RATE_URL"))
+        app.config.setdefault("LOGIN_HASH_WORKERS", int(os.getenv("LOGIN_HASH_WORKERS", 2)))
+        app.config.setdefault("LOGIN_HASH_QUEUE", int(os.getenv("LOGIN_HASH_QUEUE", 8)))
+        # Any werkzeug method string, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000"
+        app.config.setdefault("PASSWORD_HASH_METHOD", os.getenv("PASSWORD_HASH_METHOD", "scrypt"))
+
+        capacity = app.config["LOGIN_RATE_BURST"]
+        rate = app.config["LOGIN_RATE_PER_MINUTE"] / 60.0
+        if app.config["LOGIN_RATE_URL"]:
+            buckets = RedisBuckets(app.config["LOGIN_RATE_URL"], capacity, rate)
+        else:
+            buckets = MemoryBuckets(capacity, rate)
+
+        app.extensions["login_guard"] = _LoginGuardState(
+            buckets,
+            app.config["CLIENT_IP_TRUSTED"],
+            app.config["LOGIN_HASH_WORKERS"],
+            app.config["LOGIN_HASH_QUEUE"],
+            app.config["PASSWORD_HASH_METHOD"]
+        )
+
+    @property
+    def _state(self):
+        return current_app.extensions["login_guard"]
+
+    def allow(self, ip_address, email):
+        state = self._state
+        allowed = (
+            (not state.ip_limit or state.buckets.take(f"ip:{ip_address}"))
+            and state.buckets.take(f"email:{(email or '').lower()}")
+        )
+        if not allowed:
+            state.throttled += 1
+        return allowed
+
+    def verify(self, password_hash, password):
+        if not password_hash or not password:
+            return False
+        state = self._state
+        if not state.slots.acquire(blocking=False):
+            state.busy += 1
+            raise LoginBusy("Too many logins in progress")
+        try:
+            return state.executor.submit(check_password_hash, password_hash, password).result()
+        finally:
+            state.slots.release()
+
+    def hash_password(self, password):
+        return generate_password_hash(password, method=self._state.hash_method)
+
+    def stats(self):
+        state = self._state
+        return {"throttled": state.throttled, "busy": state.busy, "hash_method": state.hash_method}
@@ -0,0 +1,61 @@
+import os
+import threading
+
+
+class PeriodicWorker:
+    """
+    A daemon thread that runs `task` inside `app`'s context every `interval`
+    seconds, or straight away after wake().
+
+    start() is idempotent and per process, so each forked gunicorn worker
+    starts its own thread on first use. A failing run is logged and the loop
+    carries on.
+    """
+
+    def __init__(self, app, name, interval, task):
+        self.app = app
+        self.name = name
+        self.interval = interval
+        self.task = task
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._owner = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._owner == os.getpid()
+
+    def start(self):
+        # Returns None, so it can be registered as a before_request hook
+        if self.running:
+            return
+        self._owner = os.getpid()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def stop(self, timeout=10):
+        """Stop this process's thread, waiting for a run in progress; False if none was running."""
+        if not self.running:
+            return False
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        return True
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            try:
+                with self.app.app_context():
+                    self.task()
+            except Exception:
+                self.app.logger.exception("Background %s run failed", self.name)
@@ -0,0 +1,82 @@
+"""
+Cost per admin login for different PASSWORD_HASH_METHOD settings.
+
+Times check_password_hash (what every login pays) for each method, then runs
+a burst of verifications through LoginGuard to show throughput with its
+bounded pool. Usage:
+
+    python benchmarks/password_hash.py --method scrypt --method pbkdf2:sha256:600000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import check_password_hash, generate_password_hash  # noqa: E402
+
+from auth import LoginBusy, LoginGuard  # noqa: E402
+
+DEFAULT_METHODS = ["scrypt", "scrypt:16384:8:1", "pbkdf2:sha256:600000", "pbkdf2:sha256:260000"]
+PASSWORD = "correct horse battery staple"
+
+
+class _App:
+    """Just enough of a Flask app for LoginGuard.init_app."""
+
+    def __init__(self, **config):
+        self.config = dict(config)
+        self.extensions = {}
+
+
+def time_verify(method, runs):
+    password_hash = generate_password_hash(PASSWORD, method=method)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        check_password_hash(password_hash, PASSWORD)
+        samples.append((time.perf_counter() - start) * 1000)
+    return password_hash, statistics.median(samples)
+
+
+def burst(password_hash, workers, queue, attempts):
+    guard = LoginGuard(_App(
+        LOGIN_RATE_BURST=attempts, LOGIN_RATE_PER_MINUTE=60, LOGIN_RATE_URL=None,
+        LOGIN_HASH_WORKERS=workers, LOGIN_HASH_QUEUE=queue, PASSWORD_HASH_METHOD="scrypt",
+    ))
+
+    def attempt(_):
+        try:
+            guard.verify(password_hash, PASSWORD)
+            return True
+        except LoginBusy:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=attempts) as clients:
+        results = list(clients.map(attempt, range(attempts)))
+    elapsed = time.perf_counter() - start
+    return sum(results), attempts - sum(results), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--method", action="append", dest="methods", help="werkzeug hash method (repeatable).")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2, help="LOGIN_HASH_WORKERS for the burst.")
+    parser.add_argument("--queue", type=int, default=8, help="LOGIN_HASH_QUEUE for the burst.")
+    parser.add_argument("--burst", type=int, default=32, help="Concurrent attempts in the burst.")
+    args = parser.parse_args()
+
+    print(f"{'method':<26} {'ms/login':>9} {'logins/s/core':>14}   burst: ok / refused in s")
+    for method in args.methods or DEFAULT_METHODS:
+        password_hash, per_login = time_verify(method, args.runs)
+        ok, refused, elapsed = burst(password_hash, args.workers, args.queue, args.burst)
+        print(f"{method:<26} {per_login:>9.1f} {1000 / per_login:>14.1f}   {ok:>3} / {refused:<3} in {elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+Throughput/latency benchmark for the public and admin routes.
+
+Runs each scenario either in-process through the Flask test client (default)
+or over HTTP against a running server (--url, e.g. a local gunicorn), with
+RECAPTCHA_BACKEND=stub. Seed the database first with benchmarks/seed.py.
+Submission screening is turned off in-process; start a server benchmarked
+over HTTP with SCREEN_ENABLED=0 too, or its per-IP limit rejects the POSTs.
+
+    python benchmarks/run.py --output bench/HEAD.json
+    python benchmarks/run.py --url http://127.0.0.1:8000 --concurrency 8 --compare bench/main.json
+
+Reports are JSON with the commit, database and row counts, so runs against
+the same data can be compared; --compare flags scenarios whose p95 or
+throughput regressed by more than --threshold percent.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CSRF_INPUT = re.compile(r'name="csrf_token" value="([^"]+)"')
+
+
+# ---------- SCENARIOS ----------
+def review_form(i):
+    return {"g-recaptcha-response": "bench", "name": f"Bench {i}", "email": f"bench{i}@example.com",
+            "rating": str(i % 5 + 1), "message": "Benchmark review message."}
+
+
+def inquiry_form(i):
+    return {"full_name": f"Bench {i}", "email": f"bench{i}@example.com", "phone": "5550000",
+            "project_type": ["Landing Page"], "features": ["Contact Form", "Responsive Design"],
+            "selected_plan": "Starter", "project_goals": "Benchmark inquiry.", "timeline": "Flexible",
+            "budget": "Need guidance"}
+
+
+def contact_form(i):
+    return {"g-recaptcha-response": "bench", "name": f"Bench {i}", "email": f"bench{i}@example.com",
+            "phone": "5550000", "subject": "Benchmark", "message": "Benchmark contact message."}
+
+
+# POST scenario -> row_counts() key it must add one row to per request
+STORES = {
+    "review_post": "reviews",
+    "inquiry_post": "inquiries",
+    "contact_post": "contacts",
+}
+
+# name, method, path, form builder, needs admin, iterations multiplier
+SCENARIOS = [
+    ("home", "GET", "/", None, False, 1.0),
+    ("plans", "GET", "/plans", None, False, 1.0),
+    ("review_get", "GET", "/review", None, False, 1.0),
+    ("review_post", "POST", "/review", review_form, False, 0.5),
+    ("inquiry_post", "POST", "/inquiry", inquiry_form, False, 0.5),
+    ("contact_post", "POST", "/contact", contact_form, False, 0.5),
+    ("admin_dashboard", "GET", "/admin/dashboard", None, True, 1.0),
+    ("admin_inquiries", "GET", "/admin/inquiries", None, True, 1.0),
+    ("admin_inquiries_search", "GET", "/admin/inquiries?search=user42", None, True, 1.0),
+    ("admin_inquiries_pending", "GET", "/admin/inquiries?status=pending", None, True, 1.0),
+    ("admin_contact_messages", "GET", "/admin/contact-messages", None, True, 1.0),
+    ("admin_reviews", "GET", "/admin/reviews", None, True, 1.0),
+    ("export_inquiries_csv", "GET", "/admin/export/inquiries.csv", None, True, 0.05),
+    ("export_reviews_jsonl", "GET", "/admin/export/reviews.jsonl", None, True, 0.05),
+]
+
+
+# ---------- CLIENTS ----------
+class TestClientTarget:
+    """In-process: one app, a test client per worker thread."""
+
+    def __init__(self):
+        from app import create_app
+
+        # Every request comes from 127.0.0.1: screening would rate-limit the POSTs
+        self.app = create_app({"WTF_CSRF_ENABLED": False, "RECAPTCHA_BACKEND": "stub", "LOGIN_RATE_BURST": 1000,
+                               "SCREEN_ENABLED": False})
+        self.admin_cookie = None
+
+    def client(self, admin):
+        client = self.app.test_client()
+        if admin:
+            if self.admin_cookie is None:
+                self.admin_cookie = self._login(client)
+            client.set_cookie(self.app.config["SESSION_COOKIE_NAME"], self.admin_cookie)
+        return client
+
+    def _login(self, client):
+        response = client.post("/admin/login", data=_admin_credentials())
+        if response.status_code != 302:
+            raise SystemExit("Admin login failed; set ADMIN_EMAIL/ADMIN_PASSWORD and run `flask create-admin`.")
+        return client.get_cookie(self.app.config["SESSION_COOKIE_NAME"]).value
+
+    def request(self, client, method, path, form):
+        response = client.open(path, method=method, data=form)
+        return response.status_code, len(response.get_data())
+
+    def row_counts(self):
+        from app import submission_queue
+        from model import db, User, Review, ContactMessage, AuditLog
+
+        with self.app.app_context():
+            # Count write-behind submissions too
+            while submission_queue.enabled and submission_queue.flush():
+                pass
+
+            return {
+                "inquiries": db.session.query(db.func.count(User.id)).scalar(),
+                "reviews": db.session.query(db.func.count(Review.id)).scalar(),
+                "contacts": db.session.query(db.func.count(ContactMessage.id)).scalar(),
+                "audit_logs": db.session.query(db.func.count(AuditLog.id)).scalar(),
+            }, db.engine.dialect.name
+
+
+class HTTPTarget:
+    """Over the network: a requests.Session per worker thread, CSRF tokens scraped from forms."""
+
+    def __init__(self, base_url):
+        import requests
+
+        self.requests = requests
+        self.base_url = base_url.rstrip("/")
+        self.admin_cookies = None
+        self._lock = threading.Lock()
+
+    def client(self, admin):
+        session = self.requests.Session()
+        page = session.get(self.base_url + "/review", timeout=30).text
+        match = CSRF_INPUT.search(page)
+        session.csrf_token = match.group(1) if match else ""
+
+        if admin:
+            with self._lock:
+                if self.admin_cookies is None:
+                    self.admin_cookies = self._login()
+            session.cookies.update(self.admin_cookies)
+            page = session.get(self.base_url + "/admin/dashboard", timeout=30).text
+            match = CSRF_INPUT.search(page)
+            session.csrf_token = match.group(1) if match else session.csrf_token
+        return session
+
+    def _login(self):
+        session = self.requests.Session()
+        page = session.get(self.base_url + "/admin/login", timeout=30).text
+        match = CSRF_INPUT.search(page)
+        data = dict(_admin_credentials(), csrf_token=match.group(1) if match else "")
+        response = session.post(self.base_url + "/admin/login", data=data, allow_redirects=False, timeout=30)
+        if response.status_code != 302:
+            raise SystemExit("Admin login failed; check ADMIN_EMAIL/ADMIN_PASSWORD on the server.")
+        return session.cookies
+
+    def request(self, session, method, path, form):
+        if form is not None:
+            form = dict(form, csrf_token=session.csrf_token)
+        response = session.request(method, self.base_url + path, data=form, allow_redirects=False, timeout=120)
+        return response.status_code, len(response.content)
+
+    def row_counts(self):
+        return {}, "remote"
+
+
+def _admin_credentials():
+    return {"email": os.getenv("ADMIN_EMAIL", ""), "password": os.getenv("ADMIN_PASSWORD", "")}
+
+
+# ---------- RUNNER ----------
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(target, scenario, iterations, concurrency, warmup):
+    name, method, path, form_fn, admin, _ = scenario
+    latencies = []
+    errors = 0
+    sizes = 0
+    counter = iter(range(10 ** 9))
+    lock = threading.Lock()
+
+    def worker(count):
+        nonlocal errors, sizes
+        client = target.client(admin)
+        for _ in range(warmup):
+            target.request(client, method, path, form_fn(next(counter)) if form_fn else None)
+        for _ in range(count):
+            form = form_fn(next(counter)) if form_fn else None
+            start = time.perf_counter()
+            status, size = target.request(client, method, path, form)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                sizes += size
+                if status >= 400:
+                    errors += 1
+
+    per_worker = [iterations // concurrency + (1 if i < iterations % concurrency else 0) for i in range(concurrency)]
+    threads = [threading.Thread(target=worker, args=(n,)) for n in per_worker if n]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    ms = [v * 1000 for v in latencies]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "mean_ms": round(statistics.mean(ms), 2) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 0.50), 2),
+        "p95_ms": round(percentile(ms, 0.95), 2),
+        "p99_ms": round(percentile(ms, 0.99), 2),
+        "max_ms": round(max(ms), 2) if ms else 0.0,
+        "avg_bytes": sizes // len(latencies) if latencies else 0,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------- REPORTS ----------
+def print_report(report):
+    meta = report["meta"]
+    print(f"commit {meta['commit']}  db {meta['database']}  rows {meta['rows']}  "
+          f"mode {meta['mode']}  concurrency {meta['concurrency']}")
+    print(f"{'scenario':<26} {'reqs':>6} {'err':>4} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>9}")
+    for name, r in report["scenarios"].items():
+        print(f"{name:<26} {r['requests']:>6} {r['errors']:>4} {r['rps']:>9.1f} {r['p50_ms']:>8.1f} "
+              f"{r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>9.1f}")
+
+
+def compare(report, baseline, threshold):
+    """Print per-scenario deltas; return the names that regressed."""
+    regressed = []
+    print(f"\nvs {baseline['meta'].get('commit')} ({baseline['meta'].get('created_at')})")
+    # POST scenarios add a few rows per run; only a different data scale matters
+    rows, baseline_rows = report["meta"].get("rows", {}), baseline["meta"].get("rows", {})
+    if rows and any(abs(_delta(rows.get(k, 0), v)) > 10 for k, v in baseline_rows.items()):
+        print("warning: row counts differ from the baseline; numbers are not directly comparable")
+    if report["meta"]["mode"] != baseline["meta"].get("mode"):
+        print("warning: the baseline used a different mode (test client vs HTTP)")
+
+    for name, current in report["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if not previous:
+            continue
+        p95 = _delta(current["p95_ms"], previous["p95_ms"])
+        rps = _delta(current["rps"], previous["rps"])
+        flag = ""
+        if p95 > threshold or rps < -threshold:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        print(f"{name:<26} p95 {p95:+7.1f}%   rps {rps:+7.1f}%{flag}")
+    return regressed
+
+
+def _delta(current, previous):
+    return (current - previous) / previous * 100 if previous else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process test client.")
+    parser.add_argument("--iterations", type=int, default=200, help="Requests per scenario (scaled for slow ones).")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests per worker first.")
+    parser.add_argument("--only", action="append", help="Run only these scenarios (repeatable).")
+    parser.add_argument("--output", help="Write the JSON report here.")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against.")
+    parser.add_argument("--threshold", type=float, default=15.0, help="Regression threshold in percent.")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("RECAPTCHA_BACKEND", "stub")
+    target = HTTPTarget(args.url) if args.url else TestClientTarget()
+    rows, database = target.row_counts()
+
+    scenarios = [s for s in SCENARIOS if not args.only or s[0] in args.only]
+    results = {}
+    lost = []
+    for scenario in scenarios:
+        iterations = max(1, int(args.iterations * scenario[5]))
+        concurrency = min(args.concurrency, iterations)
+        warmup = args.warmup if scenario[5] >= 1 else 0
+        before = target.row_counts()[0] if scenario[0] in STORES else {}
+        results[scenario[0]] = run_scenario(target, scenario, iterations, concurrency, warmup)
+
+        # A POST that is answered but not stored would make the numbers meaningless
+        if before:
+            key = STORES[scenario[0]]
+            stored = target.row_counts()[0][key] - before[key]
+            results[scenario[0]]["stored"] = stored
+            if stored != iterations + warmup * concurrency:
+                lost.append(f"{scenario[0]}: {stored} of {iterations + warmup * concurrency} {key} stored")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "mode": "http" if args.url else "test-client",
+            "database": database,
+            "rows": rows,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "scenarios": results,
+    }
+    print_report(report)
+    for message in lost:
+        print(f"Not stored: {message}", file=sys.stderr)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressed = compare(report, json.load(fh), args.threshold)
+        if regressed and args.fail_on_regression:
+            sys.exit(1)
+
+    if lost:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
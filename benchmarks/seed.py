@@ -0,0 +1,150 @@
+"""
+Deterministic seed data for benchmarks.
+
+Bulk-inserts inquiries, reviews, contact messages and audit log entries into
+the configured DATABASE_URL (create the schema first with `flask db upgrade`
+or `flask init-db`), then indexes the inquiry options and reconciles the
+dashboard counters. Usage:
+
+    python benchmarks/seed.py --inquiries 100000 --reviews 20000 --contacts 20000 --audit-logs 50000
+
+Inquiry emails are user<N>@example.com, so `?search=user42` matches a
+predictable set of rows.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+
+PROJECT_TYPES = ["Business Website", "E-commerce Website", "Landing Page", "Portfolio Website",
+                 "Web App", "Website Redesign", "Maintenance"]
+FEATURES = ["Responsive Design", "Admin Dashboard", "Contact Form", "Login System",
+            "Product Management", "CMS / Content Pages", "Hosting Setup", "Chatbot Integration"]
+ADDONS = ["SEO Setup", "Logo Design", "Copywriting", "Analytics", "Extra Revisions"]
+PLANS = ["Starter", "Business", "Premium", "Custom"]
+TIMELINES = ["1–2 weeks", "2–4 weeks", "1–2 months", "Flexible"]
+BUDGETS = ["Under $100", "$100 – $300", "$300 – $700", "$700+", "Need guidance"]
+WORDS = ("website design fast clean modern support great team delivery quality "
+         "responsive layout launch project helpful update content page").split()
+
+BATCH_SIZE = 5000
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _created_at(rng, now):
+    return now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+
+
+def inquiry_rows(rng, start, count, now):
+    for i in range(start, start + count):
+        yield dict(
+            full_name=f"Bench User {i}",
+            email=f"user{i}@example.com",
+            phone=f"+1555{i:07d}"[-12:],
+            company=f"Company {i % 997}",
+            country_timezone="UTC",
+            project_type=", ".join(rng.sample(PROJECT_TYPES, rng.randint(1, 2))),
+            project_goals=_sentence(rng, 20),
+            features=", ".join(rng.sample(FEATURES, rng.randint(1, 4))),
+            selected_plan=rng.choice(PLANS),
+            addons=", ".join(rng.sample(ADDONS, rng.randint(0, 2))),
+            timeline=rng.choice(TIMELINES),
+            budget=rng.choice(BUDGETS),
+            references="",
+            is_contacted=rng.random() < 0.3,
+            created_at=_created_at(rng, now),
+        )
+
+
+def review_rows(rng, start, count, now):
+    for i in range(start, start + count):
+        yield dict(
+            name=f"Reviewer {i}",
+            email=f"reviewer{i}@example.com",
+            rating=rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 2, 4, 8])[0],
+            message=_sentence(rng, rng.randint(10, 80)),
+            created_at=_created_at(rng, now),
+        )
+
+
+def contact_rows(rng, start, count, now):
+    for i in range(start, start + count):
+        yield dict(
+            name=f"Contact {i}",
+            email=f"contact{i}@example.com",
+            phone=f"+1666{i:07d}"[-12:],
+            subject=_sentence(rng, 4),
+            message=_sentence(rng, rng.randint(20, 120)),
+            is_read=rng.random() < 0.5,
+            created_at=_created_at(rng, now),
+        )
+
+
+def audit_rows(rng, start, count, now):
+    actions = ["Admin logged in", "Admin logged out", "Viewed inquiry #{}", "Marked inquiry #{} as Contacted"]
+    for i in range(start, start + count):
+        yield dict(
+            admin_email="admin@example.com",
+            action=rng.choice(actions).format(rng.randint(1, 100000)),
+            ip_address=f"10.0.{i % 256}.{rng.randint(1, 254)}",
+            created_at=_created_at(rng, now),
+        )
+
+
+def seed_table(db, model, rows_fn, count, rng, now):
+    start = (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+    inserted = 0
+    while inserted < count:
+        batch = list(rows_fn(rng, start + inserted, min(BATCH_SIZE, count - inserted), now))
+        db.session.execute(insert(model), batch)
+        db.session.commit()
+        inserted += len(batch)
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--inquiries", type=int, default=10000)
+    parser.add_argument("--reviews", type=int, default=2000)
+    parser.add_argument("--contacts", type=int, default=2000)
+    parser.add_argument("--audit-logs", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same data).")
+    args = parser.parse_args()
+
+    from app import create_app, dashboard_stats, inquiry_options
+    from model import db, User, Review, ContactMessage, AuditLog
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    now = datetime(2026, 1, 1)
+
+    with app.app_context():
+        for label, model, rows_fn, count in (
+            ("inquiries", User, inquiry_rows, args.inquiries),
+            ("reviews", Review, review_rows, args.reviews),
+            ("contacts", ContactMessage, contact_rows, args.contacts),
+            ("audit logs", AuditLog, audit_rows, args.audit_logs),
+        ):
+            started = time.perf_counter()
+            inserted = seed_table(db, model, rows_fn, count, rng, now)
+            print(f"{label:<11} {inserted:>9} rows in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        indexed = inquiry_options.backfill()
+        print(f"Inquiry options indexed for {indexed} rows in {time.perf_counter() - started:.1f}s")
+
+        dashboard_stats.reconcile()
+        print("Dashboard counters reconciled.")
+
+
+if __name__ == "__main__":
+    main()
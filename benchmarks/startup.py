@@ -0,0 +1,85 @@
+"""
+Startup latency: module import, create_app() and the first request.
+
+Each run is a fresh interpreter, so nothing is warm. Usage:
+
+    python benchmarks/startup.py --runs 10 --path /plans --path /
+
+DATABASE_URL, SECRET_KEY etc. come from the environment / .env as usual; paths
+that query the database need a migrated database.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app as module
+t1 = time.perf_counter()
+flask_app = module.create_app()
+t2 = time.perf_counter()
+client = flask_app.test_client()
+timings = {"import": t1 - t0, "create_app": t2 - t1}
+for path in sys.argv[1:]:
+    start = time.perf_counter()
+    status = client.get(path).status_code
+    timings[f"first GET {path}"] = time.perf_counter() - start
+    timings[f"status {path}"] = status
+print(json.dumps(timings))
+"""
+
+
+def run_once(paths):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, *paths],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", action="append", dest="paths", help="Request path (repeatable, default /plans).")
+    parser.add_argument("--json", action="store_true", help="Print the raw summary as JSON.")
+    args = parser.parse_args()
+    paths = args.paths or ["/plans"]
+
+    runs = [run_once(paths) for _ in range(args.runs)]
+
+    summary = {}
+    for key in runs[0]:
+        if key.startswith("status "):
+            summary[key] = sorted({run[key] for run in runs})
+            continue
+        values = [run[key] * 1000 for run in runs]
+        summary[key] = {
+            "median_ms": round(statistics.median(values), 2),
+            "min_ms": round(min(values), 2),
+            "max_ms": round(max(values), 2),
+        }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{args.runs} cold starts")
+    for key, value in summary.items():
+        if key.startswith("status "):
+            print(f"  {key:<28} {', '.join(map(str, value))}")
+        else:
+            print(f"  {key:<28} median {value['median_ms']:>8.2f} ms  "
+                  f"(min {value['min_ms']:.2f}, max {value['max_ms']:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, g, request, session, make_response
+from flask_wtf.csrf import generate_csrf
+
+# Rendered into cached pages in place of the per-session CSRF token
+CSRF_PLACEHOLDER = "__csrf_token_placeholder__"
+
+
+def personal_session():
+    """
+    True when the session holds a login or flashed messages. Server-side
+    sessions answer from a cookie hint (ServerSession.personal) so anonymous
+    visitors are not looked up in the session store just to be served a page.
+    """
+    personal = getattr(session, "personal", None)
+    if personal is not None:
+        return personal
+    return "_user_id" in session or "_flashes" in session
+
+
+# ---------- BACKENDS ----------
+class LRUBackend:
+    """In-process LRU with a per-entry TTL."""
+
+    def __init__(self, maxsize=128, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def generation(self):
+        return self._generation
+
+    def bump_generation(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+
+class RedisBackend:
+    """
+    Shared store, so one worker's invalidation is seen by all of them.
+    Needs the optional `redis` package.
+    """
+
+    def __init__(self, url, ttl=300, prefix="sw-cache:"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("RESPONSE_CACHE_URL is set but the redis package is not installed") from exc
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=self.ttl)
+
+    def generation(self):
+        return int(self.client.get(self.prefix + "generation") or 0)
+
+    def bump_generation(self):
+        # Old entries become unreachable and expire on their own TTL
+        self.client.incr(self.prefix + "generation")
+
+
+# ---------- RESPONSE / FRAGMENT CACHE ----------
+class _ResponseCacheState:
+    """One app's cache backend and counters, kept in app.extensions["response_cache"]."""
+
+    def __init__(self, enabled, backend):
+        self.enabled = enabled
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, *parts):
+        return f"{self.backend.generation()}:" + ":".join(parts)
+
+
+class ResponseCache:
+    """
+    Page and fragment cache keyed by route and template.
+
+    Pages are only served from cache to anonymous visitors with no pending flash
+    messages. The CSRF token is rendered as a placeholder and swapped in per
+    request, so a cached page never leaks one visitor's token to another.
+    invalidate() drops everything by bumping a generation counter; with the
+    in-process backend other workers only notice once RESPONSE_CACHE_TTL passes.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RESPONSE_CACHE_ENABLED", os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1")
+        app.config.setdefault("RESPONSE_CACHE_TTL", int(os.getenv("RESPONSE_CACHE_TTL", 300)))
+        app.config.setdefault("RESPONSE_CACHE_SIZE", int(os.getenv("RESPONSE_CACHE_SIZE", 128)))
+        app.config.setdefault("RESPONSE_CACHE_URL", os.getenv("RESPONSE_CACHE_URL"))
+
+        if app.config["RESPONSE_CACHE_URL"]:
+            backend = RedisBackend(app.config["RESPONSE_CACHE_URL"], app.config["RESPONSE_CACHE_TTL"])
+        else:
+            backend = LRUBackend(app.config["RESPONSE_CACHE_SIZE"], app.config["RESPONSE_CACHE_TTL"])
+
+        app.extensions["response_cache"] = _ResponseCacheState(app.config["RESPONSE_CACHE_ENABLED"], backend)
+
+    @property
+    def _state(self):
+        return current_app.extensions["response_cache"]
+
+    def invalidate(self, *_, **__):
+        self._state.backend.bump_generation()
+
+    def stats(self):
+        state = self._state
+        total = state.hits + state.misses
+        return {
+            "enabled": state.enabled,
+            "hits": state.hits,
+            "misses": state.misses,
+            "hit_ratio": round(state.hits / total, 3) if total else 0.0,
+        }
+
+    # ---------- FRAGMENTS ----------
+    def fragment(self, name, compute):
+        """Return the cached value for `name`, computing and storing it on a miss."""
+        state = self._state
+        if not state.enabled:
+            return compute()
+
+        key = state.key("fragment", name)
+        value = state.backend.get(key)
+        if value is not None:
+            state.hits += 1
+            return value
+
+        state.misses += 1
+        value = compute()
+        state.backend.set(key, value)
+        return value
+
+    # ---------- PAGES ----------
+    def page(self, template):
+        """
+        Cache a GET view that renders `template`. The view must return the
+        rendered string (not a Response) and must not depend on the visitor.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                state = self._state
+                if not self._cacheable(state):
+                    return view(*args, **kwargs)
+
+                key = state.key("page", request.endpoint, template, request.host_url)
+                entry = state.backend.get(key)
+                if entry is None:
+                    state.misses += 1
+                    g.csrf_placeholder = True
+                    body = view(*args, **kwargs)
+                    g.csrf_placeholder = False
+                    entry = {
+                        "body": body,
+                        "etag": hashlib.sha1(body.encode("utf-8")).hexdigest(),
+                        "last_modified": datetime.now(timezone.utc).replace(microsecond=0),
+                    }
+                    state.backend.set(key, entry)
+                else:
+                    state.hits += 1
+
+                response = make_response(entry["body"].replace(CSRF_PLACEHOLDER, generate_csrf()))
+                # Weak: the bytes differ per visitor by the CSRF token only
+                response.set_etag(entry["etag"], weak=True)
+                response.last_modified = entry["last_modified"]
+                response.headers["Cache-Control"] = "private, no-cache"
+                return response.make_conditional(request)
+            return wrapper
+        return decorator
+
+    def csrf_token(self):
+        """Template global used in place of generate_csrf (see inject_csrf_token)."""
+        if g.get("csrf_placeholder"):
+            return CSRF_PLACEHOLDER
+        return generate_csrf()
+
+    @staticmethod
+    def _cacheable(state):
+        return (
+            state.enabled
+            and request.method == "GET"
+            and not personal_session()
+        )
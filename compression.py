@@ -0,0 +1,169 @@
+import gzip
+import os
+import zlib
+
+from flask import current_app, g, request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only without it
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = (
+    "text/html", "text/plain", "text/css", "text/csv", "text/xml",
+    "application/json", "application/x-ndjson", "application/xml", "application/javascript",
+)
+
+
+# ---------- STREAMING ENCODERS ----------
+def _encode_stream(chunks, compress, flush, finish):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            # Flush per chunk so each one reaches the client as soon as it is produced
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        # Lets stream_with_context clean up when the client goes away
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _gzip_stream(chunks, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return _encode_stream(chunks, compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush)
+
+
+def _brotli_stream(chunks, quality):
+    compressor = brotli.Compressor(quality=quality)
+    return _encode_stream(chunks, compressor.process, compressor.flush, compressor.finish)
+
+
+class Compression:
+    """
+    gzip/brotli for dynamic HTML, JSON and text responses, plus weak ETags.
+
+    Buffered GET responses get a weak ETag of their body (answered with 304 on
+    If-None-Match) and are compressed when at least COMPRESS_MIN_SIZE bytes.
+    Streamed responses such as exports are compressed chunk by chunk. File
+    responses (send_file / send_from_directory, static files) and anything
+    already encoded, like the pre-rendered pages, are left alone.
+
+    Responses that rendered a CSRF token (every admin page, the public forms)
+    are not compressed unless their route sets compress=True: next to
+    reflected input such as ?search= that would be a BREACH oracle for the
+    token. Only opt in views that echo no request input.
+
+    Per route: decorate a view with @compression.options(compress=..., etag=...,
+    min_size=...), or set COMPRESS_ROUTES = {"endpoint": {...}} in the config,
+    which wins over the decorator.
+    """
+
+    def __init__(self, app=None):
+        # Filled by @options at import time, so shared by every app
+        self.endpoints = {}
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("COMPRESS_ENABLED", os.getenv("COMPRESS_ENABLED", "1") == "1")
+        app.config.setdefault("COMPRESS_MIN_SIZE", int(os.getenv("COMPRESS_MIN_SIZE", 500)))
+        app.config.setdefault("COMPRESS_GZIP_LEVEL", int(os.getenv("COMPRESS_GZIP_LEVEL", 6)))
+        app.config.setdefault("COMPRESS_BR_QUALITY", int(os.getenv("COMPRESS_BR_QUALITY", 4)))
+        app.config.setdefault("COMPRESS_STREAMS", os.getenv("COMPRESS_STREAMS", "1") == "1")
+        app.config.setdefault("COMPRESS_ETAGS", os.getenv("COMPRESS_ETAGS", "1") == "1")
+        app.config.setdefault("COMPRESS_ROUTES", {})
+
+        if app.config["COMPRESS_ENABLED"]:
+            app.after_request(self.process_response)
+        app.extensions["compression"] = self
+
+    def options(self, **options):
+        """Per-view overrides: compress, etag, min_size."""
+        def decorator(view):
+            self.endpoints[view.__name__] = options
+            return view
+        return decorator
+
+    def _route_options(self):
+        config = current_app.config
+        options = {
+            # BREACH: a CSRF token compressed next to reflected input leaks through
+            # the response size, so pages that rendered one must opt in explicitly
+            "compress": config.get("WTF_CSRF_FIELD_NAME", "csrf_token") not in g,
+            "etag": config["COMPRESS_ETAGS"],
+            "min_size": config["COMPRESS_MIN_SIZE"],
+        }
+        options.update(self.endpoints.get(request.endpoint, {}))
+        options.update(config["COMPRESS_ROUTES"].get(request.endpoint, {}))
+        return options
+
+    def _encoding(self):
+        accept = request.accept_encodings
+        if brotli is not None and accept["br"] and accept["br"] >= accept["gzip"]:
+            return "br"
+        if accept["gzip"]:
+            return "gzip"
+        return None
+
+    # ---------- AFTER REQUEST ----------
+    def process_response(self, response):
+        if (
+            response.direct_passthrough
+            or response.status_code != 200
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        options = self._route_options()
+
+        if response.is_streamed:
+            if options["compress"] and current_app.config["COMPRESS_STREAMS"] and request.method != "HEAD":
+                self._compress_stream(response)
+            return response
+
+        if options["etag"] and request.method in ("GET", "HEAD") and not response.get_etag()[0]:
+            response.add_etag(weak=True)
+            response = response.make_conditional(request)
+            if response.status_code == 304:
+                if options["compress"]:
+                    response.vary.add("Accept-Encoding")
+                return response
+
+        if options["compress"] and response.content_length is not None and response.content_length >= options["min_size"]:
+            self._compress_buffered(response)
+        return response
+
+    def _compress_buffered(self, response):
+        encoding = self._encoding()
+        response.vary.add("Accept-Encoding")
+        if encoding is None:
+            return
+
+        body = response.get_data()
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=current_app.config["COMPRESS_BR_QUALITY"])
+        else:
+            compressed = gzip.compress(body, compresslevel=current_app.config["COMPRESS_GZIP_LEVEL"], mtime=0)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+
+    def _compress_stream(self, response):
+        encoding = self._encoding()
+        response.vary.add("Accept-Encoding")
+        if encoding is None:
+            return
+
+        if encoding == "br":
+            response.response = _brotli_stream(response.response, current_app.config["COMPRESS_BR_QUALITY"])
+        else:
+            response.response = _gzip_stream(response.response, current_app.config["COMPRESS_GZIP_LEVEL"])
+        response.headers["Content-Encoding"] = encoding
+        response.headers.pop("Content-Length", None)
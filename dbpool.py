@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import NullPool, QueuePool
+
+from model import db
+
+
+class PoolStats:
+    """One app's counters fed by pool events and timed checkouts, kept in app.extensions["engine_pool"]."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.errors = 0
+        self.connects = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds, error=None):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if isinstance(error, PoolTimeout):
+                self.timeouts += 1
+            elif error is not None:
+                self.errors += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+def timed_pool(base, stats):
+    """A `base` pool subclass that times how long each checkout waits."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            entry = base._do_get(self)
+        except Exception as exc:
+            stats.record_wait(time.perf_counter() - start, error=exc)
+            raise
+        stats.record_wait(time.perf_counter() - start)
+        return entry
+
+    # recreate() (engine.dispose) instantiates self.__class__, so stats survive
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+class EnginePool:
+    """
+    Engine options for SQLALCHEMY_DATABASE_URI, driven by DB_* env vars.
+
+    For PostgreSQL: a LIFO QueuePool with pre-ping and recycle so idle SSL
+    connections dropped by the server are replaced before use instead of
+    failing the first request, TCP keepalives, and an optional per-statement
+    timeout (DB_STATEMENT_TIMEOUT, off by default: it would also cut short
+    migrations, exports and other long CLI commands run with the same config).
+    DB_PGBOUNCER=1 leaves pooling to PgBouncer (transaction mode): NullPool,
+    no startup parameters, and the timeout applied with SET LOCAL per
+    transaction. Other databases keep SQLAlchemy's defaults.
+
+    Must be initialised before db.init_app(), which reads the options.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("DB_POOL_SIZE", int(os.getenv("DB_POOL_SIZE", 5)))
+        app.config.setdefault("DB_MAX_OVERFLOW", int(os.getenv("DB_MAX_OVERFLOW", 5)))
+        app.config.setdefault("DB_POOL_TIMEOUT", float(os.getenv("DB_POOL_TIMEOUT", 10)))
+        app.config.setdefault("DB_POOL_RECYCLE", int(os.getenv("DB_POOL_RECYCLE", 300)))
+        app.config.setdefault("DB_POOL_PRE_PING", os.getenv("DB_POOL_PRE_PING", "1") == "1")
+        # Milliseconds; 0 disables
+        app.config.setdefault("DB_STATEMENT_TIMEOUT", int(os.getenv("DB_STATEMENT_TIMEOUT", 0)))
+        app.config.setdefault("DB_CONNECT_TIMEOUT", int(os.getenv("DB_CONNECT_TIMEOUT", 5)))
+        app.config.setdefault("DB_KEEPALIVES_IDLE", int(os.getenv("DB_KEEPALIVES_IDLE", 30)))
+        app.config.setdefault("DB_PGBOUNCER", os.getenv("DB_PGBOUNCER", "0") == "1")
+
+        stats = app.extensions["engine_pool"] = PoolStats()
+        options = app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {})
+        for key, value in self.engine_options(app.config, stats).items():
+            options.setdefault(key, value)
+
+    @property
+    def stats(self):
+        return current_app.extensions["engine_pool"]
+
+    # ---------- OPTIONS ----------
+    def _backend(self, config):
+        uri = config.get("SQLALCHEMY_DATABASE_URI")
+        return make_url(uri).get_backend_name() if uri else None
+
+    def engine_options(self, config, stats):
+        if self._backend(config) != "postgresql":
+            return {}
+
+        connect_args = {
+            "connect_timeout": config["DB_CONNECT_TIMEOUT"],
+            "keepalives": 1,
+            "keepalives_idle": config["DB_KEEPALIVES_IDLE"],
+            "keepalives_interval": 10,
+            "keepalives_count": 3,
+        }
+
+        if config["DB_PGBOUNCER"]:
+            return {
+                "poolclass": timed_pool(NullPool, stats),
+                "connect_args": connect_args,
+            }
+
+        if config["DB_STATEMENT_TIMEOUT"]:
+            connect_args["options"] = f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT']}"
+
+        return {
+            "poolclass": timed_pool(QueuePool, stats),
+            "pool_size": config["DB_POOL_SIZE"],
+            "max_overflow": config["DB_MAX_OVERFLOW"],
+            "pool_timeout": config["DB_POOL_TIMEOUT"],
+            "pool_recycle": config["DB_POOL_RECYCLE"],
+            "pool_pre_ping": config["DB_POOL_PRE_PING"],
+            # Reuse the most recent connection so surplus ones idle out via recycle
+            "pool_use_lifo": True,
+            "connect_args": connect_args,
+        }
+
+    # ---------- EVENTS ----------
+    def attach(self, engine):
+        """
+        Hook connect/invalidate counters (plus SQLite foreign keys and the
+        PgBouncer timeout) onto an engine; call with its app context pushed.
+        """
+        stats = self.stats
+        sqlite = engine.dialect.name == "sqlite"
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            with stats._lock:
+                stats.connects += 1
+            if sqlite:
+                # Off by default in SQLite; inquiry_options relies on ON DELETE CASCADE
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA foreign_keys=ON")
+                cursor.close()
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with stats._lock:
+                stats.invalidations += 1
+
+        timeout = current_app.config["DB_STATEMENT_TIMEOUT"]
+        if current_app.config["DB_PGBOUNCER"] and timeout and engine.dialect.name == "postgresql":
+            @event.listens_for(engine, "begin")
+            def set_statement_timeout(conn):
+                # Session-level SET would leak to other clients of the server connection
+                conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+    # ---------- METRICS ----------
+    def metrics(self):
+        pool = db.engine.pool
+        data = {
+            "pool": type(pool).__name__,
+            "pgbouncer": current_app.config["DB_PGBOUNCER"],
+        }
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, name):
+                data[name] = getattr(pool, name)()
+        data.update(self.stats.as_dict())
+        return data
+
+    def health(self):
+        start = time.perf_counter()
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            current_app.logger.warning("Database health check failed: %s", exc)
+            return False, None
+        return True, round((time.perf_counter() - start) * 1000, 3)
@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+
+import click
+from flask import Response, stream_with_context
+from flask.cli import with_appcontext
+
+from model import User, ContactMessage, Review, AuditLog
+from queries import inquiry_query, option_filters
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+# kind -> (model, exported columns)
+EXPORTS = {
+    "inquiries": (User, [
+        "id", "full_name", "email", "phone", "company", "country_timezone",
+        "project_type", "project_goals", "features", "selected_plan", "addons",
+        "timeline", "budget", "references", "is_contacted", "created_at",
+    ]),
+    "contacts": (ContactMessage, [
+        "id", "name", "email", "phone", "subject", "message", "is_read", "created_at",
+    ]),
+    "reviews": (Review, [
+        "id", "name", "email", "rating", "message", "created_at",
+    ]),
+    "audit-logs": (AuditLog, [
+        "id", "admin_email", "action", "ip_address", "created_at",
+    ]),
+}
+
+# Leading characters a spreadsheet would read as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# Rows fetched per server-side cursor round trip, and rows per yielded chunk
+YIELD_PER = 1000
+CHUNK_ROWS = 500
+
+
+def export_query(kind, search="", status="", options=None):
+    model, columns = EXPORTS[kind]
+    query = inquiry_query(search, status, options) if kind == "inquiries" else model.query
+
+    # Plain column tuples through a server-side cursor: constant memory per export
+    return query.with_entities(
+        *[getattr(model, name) for name in columns]
+    ).order_by(model.id).yield_per(YIELD_PER)
+
+
+def _value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    """_value(), with formula-like text quoted so a spreadsheet shows it as text."""
+    value = _value(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_rows(kind, fmt, search="", status="", options=None):
+    """Yield the export as text chunks, starting before the whole result is read."""
+    _, columns = EXPORTS[kind]
+    rows = export_query(kind, search, status, options)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(columns)
+
+    for count, row in enumerate(rows, 1):
+        if writer:
+            writer.writerow([_csv_value(v) for v in row])
+        else:
+            buffer.write(json.dumps(dict(zip(columns, map(_value, row)))) + "\n")
+
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def export_response(kind, fmt, search="", status="", options=None):
+    filename = f"{kind}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    return Response(
+        stream_with_context(stream_rows(kind, fmt, search, status, options)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            # Don't let a proxy buffer the whole export before sending it
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+@click.command("export")
+@click.argument("kind", type=click.Choice(list(EXPORTS)))
+@click.option("--format", "fmt", type=click.Choice(list(EXPORT_FORMATS)), default="csv")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="File to write (default: stdout).")
+@click.option("--search", default="", help="Inquiries only: name/email search, as on /admin/inquiries.")
+@click.option("--status", type=click.Choice(["", "pending", "contacted"]), default="", help="Inquiries only.")
+@click.option("--project-type", default="", help="Inquiries only: requested project type.")
+@click.option("--feature", default="", help="Inquiries only: requested feature.")
+@click.option("--addon", default="", help="Inquiries only: requested add-on.")
+@with_appcontext
+def export_command(kind, fmt, output, search, status, project_type, feature, addon):
+    """Stream inquiries, contacts, reviews or audit logs as CSV/JSONL."""
+    options = option_filters(dict(project_type=project_type, feature=feature, addon=addon))
+    out = open(output, "w", newline="") if output else sys.stdout
+    try:
+        for chunk in stream_rows(kind, fmt, search, status, options):
+            out.write(chunk)
+    finally:
+        if output:
+            out.close()
@@ -0,0 +1,21 @@
+import os
+
+# With preload the app is built once in the master and shared copy-on-write by
+# the workers. create_app() opens no connections, and the background threads
+# start per process, so this is opt-in only to keep reloads simple.
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+
+wsgi_app = "app:app"
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+
+    # Drop any pooled connection the master happened to open; the child must
+    # never share a socket with its parent.
+    from app import db
+
+    with server.app.wsgi().app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
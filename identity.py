@@ -0,0 +1,110 @@
+import os
+
+from flask import current_app
+from flask_login import UserMixin
+
+from cache import LRUBackend
+from model import db, Admin
+
+# Copied onto the snapshot; password_hash deliberately is not
+IDENTITY_FIELDS = (
+    "id", "name", "email", "phone", "gender", "role",
+    "is_admin", "email_verified", "phone_verified", "created_at",
+)
+
+
+class AdminIdentity(UserMixin):
+    """
+    Read-only snapshot of an Admin row, used as current_user.
+
+    It is not attached to any session, so one instance can be shared between
+    requests and threads; to change an admin, load the Admin row itself.
+    """
+
+    def __init__(self, admin):
+        for field in IDENTITY_FIELDS:
+            object.__setattr__(self, field, getattr(admin, field))
+        object.__setattr__(self, "_is_active", admin.is_active)
+        object.__setattr__(self, "credential_version", admin.credential_version)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"AdminIdentity is read-only (tried to set {name!r})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"AdminIdentity is read-only (tried to delete {name!r})")
+
+    @property
+    def is_active(self):
+        return self._is_active
+
+    def get_id(self):
+        return f"{self.id}:{self.credential_version}"
+
+
+class _IdentityCacheState:
+    """One app's cached identities, kept in app.extensions["identity_cache"]."""
+
+    def __init__(self, maxsize, ttl):
+        self.backend = LRUBackend(maxsize, ttl)
+        self.hits = 0
+        self.misses = 0
+
+
+class AdminIdentityCache:
+    """
+    Per-process cache behind login_manager.user_loader.
+
+    Session ids look like "<id>:<credential version>" (see Admin.get_id). A cached
+    identity is used only while its version matches the session's, so changing
+    the email or password makes every older session miss, reload and be
+    rejected. Ids without a version predate versioning and are rejected as
+    stale. Other workers drop their copy within IDENTITY_CACHE_TTL seconds.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("IDENTITY_CACHE_TTL", int(os.getenv("IDENTITY_CACHE_TTL", 60)))
+        app.config.setdefault("IDENTITY_CACHE_SIZE", int(os.getenv("IDENTITY_CACHE_SIZE", 64)))
+
+        app.extensions["identity_cache"] = _IdentityCacheState(
+            app.config["IDENTITY_CACHE_SIZE"], app.config["IDENTITY_CACHE_TTL"]
+        )
+
+    @property
+    def _state(self):
+        return current_app.extensions["identity_cache"]
+
+    def load(self, user_id):
+        admin_id, _, version = str(user_id).partition(":")
+        # Sessions from before versioned ids carry no version and must sign in again
+        if not version:
+            return None
+        try:
+            admin_id = int(admin_id)
+        except ValueError:
+            return None
+
+        state = self._state
+        identity = state.backend.get(admin_id)
+        if identity is not None and identity.credential_version == version:
+            state.hits += 1
+            return identity
+        state.misses += 1
+
+        admin = db.session.get(Admin, admin_id)
+        if admin is None:
+            state.backend.delete(admin_id)
+            return None
+
+        identity = AdminIdentity(admin)
+        state.backend.set(admin_id, identity)
+
+        if version != identity.credential_version:
+            return None
+        return identity
+
+    def invalidate(self, admin_id):
+        self._state.backend.delete(admin_id)
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import threading
+
+import click
+from flask import current_app, url_for
+from markupsafe import Markup, escape
+
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# Preferred first: browsers take the first <source> they support
+FORMATS = (
+    ("avif", "image/avif", {"quality": 50, "speed": 6}),
+    ("webp", "image/webp", {"quality": 78, "method": 6}),
+    ("png", "image/png", {"optimize": True}),
+)
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _ManifestState:
+    """One app's parsed image manifest, kept in app.extensions["images"]."""
+
+    def __init__(self):
+        self.manifest = {}
+        self.mtime = None
+        self.lock = threading.Lock()
+
+
+class ImagePipeline:
+    """
+    Builds resized AVIF/WebP/PNG variants of static/images and renders
+    <picture> markup for them.
+
+    `flask images build` writes content-hashed files plus a manifest to
+    IMAGES_OUTPUT_DIR (under static/), skipping sources whose hash is already in
+    the manifest. responsive_image() falls back to a plain <img> for anything
+    not in the manifest, so templates work before the first build.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("IMAGES_SOURCE_DIR", "images")
+        app.config.setdefault("IMAGES_OUTPUT_DIR", "images/optimized")
+        app.config.setdefault("IMAGES_WIDTHS", [200, 400, 650, 960, 1300])
+
+        app.add_template_global(self.responsive_image, "responsive_image")
+        app.add_template_global(self.background_image, "background_image")
+        app.extensions["images"] = _ManifestState()
+
+        @app.cli.group("images")
+        def images_group():
+            """Responsive image variants."""
+
+        @images_group.command("build")
+        @click.option("--force", is_flag=True, help="Rebuild even if the source is unchanged.")
+        def build_command(force):
+            """Generate resized AVIF/WebP/PNG variants and the manifest."""
+            built, skipped = self.build(force=force)
+            click.echo(f"Built {built} images, skipped {skipped} unchanged.")
+
+    # ---------- PATHS ----------
+    @property
+    def source_dir(self):
+        return os.path.join(current_app.static_folder, current_app.config["IMAGES_SOURCE_DIR"])
+
+    @property
+    def output_dir(self):
+        return os.path.join(current_app.static_folder, current_app.config["IMAGES_OUTPUT_DIR"])
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.output_dir, "manifest.json")
+
+    # ---------- BUILD ----------
+    def build(self, force=False):
+        try:
+            from PIL import Image, features
+        except ImportError as exc:
+            raise click.ClickException("Pillow is required to build images: pip install Pillow") from exc
+
+        formats = [f for f in FORMATS if f[0] != "avif" or features.check("avif")]
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self.load_manifest()
+        built = skipped = 0
+
+        for name in sorted(os.listdir(self.source_dir)):
+            path = os.path.join(self.source_dir, name)
+            if not name.lower().endswith(SOURCE_EXTENSIONS) or not os.path.isfile(path):
+                continue
+
+            logical = f"{current_app.config['IMAGES_SOURCE_DIR']}/{name}"
+            source_hash = _file_hash(path)
+            entry = manifest.get(logical)
+            if not force and entry and entry["source_hash"] == source_hash and self._outputs_exist(entry):
+                skipped += 1
+                continue
+
+            with Image.open(path) as image:
+                image.load()
+                manifest[logical] = self._build_one(image, name, source_hash, formats)
+            built += 1
+
+        with open(self.manifest_path, "w") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+        current_app.extensions["images"].mtime = None
+        return built, skipped
+
+    def _build_one(self, image, name, source_hash, formats):
+        from PIL import Image
+
+        stem = os.path.splitext(name)[0]
+        width, height = image.size
+        widths = sorted({w for w in current_app.config["IMAGES_WIDTHS"] if w < width} | {width})
+        variants = {}
+
+        for ext, _, options in formats:
+            variants[ext] = []
+            for target in widths:
+                resized = image if target == width else image.resize(
+                    (target, round(height * target / width)), Image.LANCZOS
+                )
+                if ext != "png" and resized.mode not in ("RGB", "RGBA"):
+                    resized = resized.convert("RGBA")
+
+                tmp_path = os.path.join(self.output_dir, f".{stem}-{target}.{ext}.tmp")
+                resized.save(tmp_path, format=ext.upper(), **options)
+                digest = _file_hash(tmp_path)[:10]
+                filename = f"{stem}-{target}.{digest}.{ext}"
+                os.replace(tmp_path, os.path.join(self.output_dir, filename))
+
+                variants[ext].append([target, f"{current_app.config['IMAGES_OUTPUT_DIR']}/{filename}"])
+
+        return {
+            "source_hash": source_hash,
+            "width": width,
+            "height": height,
+            "variants": variants,
+        }
+
+    def _outputs_exist(self, entry):
+        static = current_app.static_folder
+        return all(
+            os.path.exists(os.path.join(static, path))
+            for files in entry["variants"].values()
+            for _, path in files
+        )
+
+    # ---------- MANIFEST ----------
+    def load_manifest(self):
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime
+        except OSError:
+            return {}
+
+        state = current_app.extensions["images"]
+        if mtime != state.mtime:
+            with state.lock:
+                with open(self.manifest_path) as fh:
+                    state.manifest = json.load(fh)
+                state.mtime = mtime
+        return state.manifest
+
+    # ---------- TEMPLATE HELPER ----------
+    def _srcset(self, files):
+        return ", ".join(f"{url_for('static', filename=path)} {w}w" for w, path in files)
+
+    def responsive_image(self, filename, alt="", sizes="100vw", dark=None, loading="lazy", **attrs):
+        """
+        <picture> markup for `filename` (relative to static/). With dark=True the
+        '-dark' twin's srcsets are attached as data attributes for the theme toggle.
+        """
+        manifest = self.load_manifest()
+        entry = manifest.get(filename)
+
+        attrs = {("class" if k == "class_" else k.replace("_", "-")): v for k, v in attrs.items()}
+        attrs.update(alt=alt, loading=loading, decoding="async")
+
+        if entry is None:
+            attrs["src"] = url_for("static", filename=filename)
+            if dark:
+                # Explicit, since fingerprinted names defeat main.js's "-dark" rewrite
+                stem, ext = os.path.splitext(filename)
+                attrs["data-light-src"] = attrs["src"]
+                attrs["data-dark-src"] = url_for("static", filename=f"{stem}-dark{ext}")
+            return Markup(f"<img {self._attrs(attrs)}>")
+
+        dark_entry = None
+        if dark:
+            stem, ext = os.path.splitext(filename)
+            dark_entry = manifest.get(f"{stem}-dark{ext}")
+
+        sources = []
+        for ext, mimetype, _ in FORMATS:
+            if ext == "png" or ext not in entry["variants"]:
+                continue
+            source = {"type": mimetype, "srcset": self._srcset(entry["variants"][ext]), "sizes": sizes}
+            if dark_entry and ext in dark_entry["variants"]:
+                source["data-light-srcset"] = source["srcset"]
+                source["data-dark-srcset"] = self._srcset(dark_entry["variants"][ext])
+            sources.append(f"<source {self._attrs(source)}>")
+
+        pngs = entry["variants"]["png"]
+        attrs.update(
+            src=url_for("static", filename=self._fallback(pngs)),
+            srcset=self._srcset(pngs),
+            sizes=sizes,
+            width=entry["width"],
+            height=entry["height"],
+        )
+        if dark_entry:
+            dark_pngs = dark_entry["variants"]["png"]
+            attrs["data-light-src"] = attrs["src"]
+            attrs["data-dark-src"] = url_for("static", filename=self._fallback(dark_pngs))
+            attrs["data-light-srcset"] = attrs["srcset"]
+            attrs["data-dark-srcset"] = self._srcset(dark_pngs)
+
+        return Markup("<picture>" + "".join(sources) + f"<img {self._attrs(attrs)}></picture>")
+
+    def background_image(self, filename, width):
+        """
+        CSS background-image declarations for `filename`: the PNG variant closest
+        to `width`, then an image-set() of every format for browsers that pick.
+        """
+        entry = self.load_manifest().get(filename)
+        if entry is None:
+            return Markup(f'background-image: url("{url_for("static", filename=filename)}");')
+
+        candidates = []
+        for ext, mimetype, _ in FORMATS:
+            if ext in entry["variants"]:
+                path = self._closest(entry["variants"][ext], width)
+                candidates.append(f'url("{url_for("static", filename=path)}") type("{mimetype}")')
+
+        png = url_for("static", filename=self._closest(entry["variants"]["png"], width))
+        return Markup(f'background-image: url("{png}"); '
+                      f'background-image: image-set({", ".join(candidates)});')
+
+    @staticmethod
+    def _closest(files, width):
+        wide_enough = [path for w, path in files if w >= width]
+        return wide_enough[0] if wide_enough else files[-1][1]
+
+    @staticmethod
+    def _fallback(files):
+        # src for browsers without srcset: the largest variant up to 1300px
+        fitting = [path for w, path in files if w <= 1300]
+        return fitting[-1] if fitting else files[0][1]
+
+    @staticmethod
+    def _attrs(attrs):
+        return " ".join(f'{k}="{escape(v)}"' for k, v in attrs.items() if v is not None)
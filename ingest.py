@@ -0,0 +1,316 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from blinker import Namespace
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from background import PeriodicWorker
+from model import db, User, ContactMessage, Review
+
+signals = Namespace()
+# Sent with the submission kind as sender and rows=[fields, ...] (each including
+# the new "id") after the rows are inserted but before the commit, so receivers
+# can write in the same transaction
+submissions_inserting = signals.signal("submissions-inserting")
+# Sent with the submission kind as sender once rows are committed
+submission_committed = signals.signal("submission-committed")
+
+MODELS = {
+    "inquiry": User,
+    "contact": ContactMessage,
+    "review": Review,
+}
+
+
+class ValidationError(ValueError):
+    pass
+
+
+def validate(kind, fields):
+    """Reject submissions that would fail the NOT NULL constraints at flush time."""
+    model = MODELS[kind]
+    missing = [
+        column.name for column in model.__table__.columns
+        if not column.nullable
+        and not column.primary_key
+        and column.default is None
+        and column.server_default is None
+        and not fields.get(column.name)
+    ]
+    if missing:
+        raise ValidationError(f"Missing required fields: {', '.join(missing)}")
+
+
+# ---------- JOURNAL ----------
+class Journal:
+    """
+    Durable append-only journal in a local SQLite file (WAL mode).
+
+    Rows are claimed by a flusher before being written to the main database and
+    deleted afterwards. Claims older than claim_timeout are picked up again, which
+    is how a crashed worker's backlog gets replayed. Delivery is at-least-once.
+    """
+
+    def __init__(self, path, claim_timeout=60):
+        self.path = path
+        self.claim_timeout = claim_timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        # Opened lazily, and never reused across a fork (gunicorn --preload)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS submissions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    claimed_by TEXT,
+                    claimed_at REAL,
+                    failed INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def append(self, kind, fields):
+        self._connect().execute(
+            "INSERT INTO submissions (kind, payload) VALUES (?, ?)",
+            (kind, json.dumps(fields, default=str))
+        )
+
+    def claim(self, owner, limit):
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("""
+                UPDATE submissions SET claimed_by = ?, claimed_at = ?
+                WHERE id IN (
+                    SELECT id FROM submissions
+                    WHERE failed = 0 AND (claimed_by IS NULL OR claimed_at < ?)
+                    ORDER BY id LIMIT ?
+                )
+            """, (owner, now, now - self.claim_timeout, limit))
+            rows = conn.execute(
+                "SELECT id, kind, payload FROM submissions "
+                "WHERE claimed_by = ? AND claimed_at = ? AND failed = 0 ORDER BY id",
+                (owner, now)
+            ).fetchall()
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        return [(row_id, kind, json.loads(payload)) for row_id, kind, payload in rows]
+
+    def delete(self, ids):
+        if ids:
+            self._connect().executemany("DELETE FROM submissions WHERE id = ?", [(i,) for i in ids])
+
+    def mark_failed(self, ids):
+        if ids:
+            self._connect().executemany("UPDATE submissions SET failed = 1 WHERE id = ?", [(i,) for i in ids])
+
+    def depth(self):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM submissions WHERE failed = 0"
+        ).fetchone()[0]
+
+    def failed_count(self):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM submissions WHERE failed = 1"
+        ).fetchone()[0]
+
+
+# ---------- WRITE-BEHIND QUEUE ----------
+class _QueueState:
+    """The journal of one app (app.extensions["ingest"]); its flusher writes to that app's database."""
+
+    def __init__(self, app):
+        self.app = app
+        self.enabled = app.config["INGEST_ENABLED"]
+        self.batch_size = app.config["INGEST_BATCH_SIZE"]
+        self.flusher = PeriodicWorker(app, "ingest-flusher", app.config["INGEST_FLUSH_INTERVAL"], self._drain)
+        self.journal = None
+        self.flushed = 0
+        self._pending = 0
+
+        if self.enabled:
+            os.makedirs(os.path.dirname(app.config["INGEST_JOURNAL"]) or ".", exist_ok=True)
+            self.journal = Journal(app.config["INGEST_JOURNAL"], app.config["INGEST_CLAIM_TIMEOUT"])
+
+    # ---------- PRODUCER ----------
+    def submit(self, kind, fields):
+        validate(kind, fields)
+        fields.setdefault("created_at", datetime.utcnow())
+
+        if not self.enabled:
+            row = MODELS[kind](**fields)
+            db.session.add(row)
+            db.session.flush()
+            submissions_inserting.send(kind, rows=[dict(fields, id=row.id)])
+            db.session.commit()
+            submission_committed.send(kind)
+            return
+
+        self._ensure_started()
+        self.journal.append(kind, fields)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flusher.wake()
+
+    def depth(self):
+        return self.journal.depth() if self.enabled else 0
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "depth": self.depth(),
+            "failed": self.journal.failed_count() if self.enabled else 0,
+            "flushed": self.flushed,
+        }
+
+    # ---------- FLUSHER ----------
+    def _ensure_started(self):
+        if not self.flusher.running:
+            self.flusher.start()
+            atexit.register(self.shutdown)
+
+    def start(self):
+        """Start flushing now, replaying anything left in the journal by a previous run."""
+        if not self.enabled or self.flusher.running:
+            return
+        self._ensure_started()
+        self.flusher.wake()
+
+    def _drain(self):
+        while self.flush() == self.batch_size:
+            pass
+
+    def flush(self):
+        owner = f"{os.uname().nodename}:{os.getpid()}"
+        batch = self.journal.claim(owner, self.batch_size)
+        if not batch:
+            return 0
+        self._pending = 0
+
+        by_kind = {}
+        for row_id, kind, fields in batch:
+            if "created_at" in fields:
+                fields["created_at"] = datetime.fromisoformat(fields["created_at"])
+            by_kind.setdefault(kind, []).append((row_id, fields))
+
+        with self.app.app_context():
+            for kind, rows in by_kind.items():
+                model = MODELS[kind]
+                try:
+                    ids = self._insert(model, [fields for _, fields in rows])
+                    submissions_inserting.send(kind, rows=[dict(fields, id=i) for (_, fields), i in zip(rows, ids)])
+                    db.session.commit()
+                    done, failed = [row_id for row_id, _ in rows], []
+                except SQLAlchemyError:
+                    db.session.rollback()
+                    done, failed = self._flush_one_by_one(kind, rows)
+
+                self.journal.delete(done)
+                self.journal.mark_failed(failed)
+                self.flushed += len(done)
+                if done:
+                    submission_committed.send(kind)
+
+        return len(batch)
+
+    @staticmethod
+    def _insert(model, rows):
+        """Bulk INSERT ... RETURNING id, ids in the order of `rows`."""
+        return db.session.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+
+    def _flush_one_by_one(self, kind, rows):
+        model = MODELS[kind]
+        done, failed = [], []
+        for row_id, fields in rows:
+            try:
+                ids = self._insert(model, [fields])
+                submissions_inserting.send(kind, rows=[dict(fields, id=ids[0])])
+                db.session.commit()
+                done.append(row_id)
+            except SQLAlchemyError as exc:
+                db.session.rollback()
+                self.app.logger.error("Dropping journalled %s #%s: %s", model.__tablename__, row_id, exc)
+                failed.append(row_id)
+        return done, failed
+
+    def shutdown(self):
+        if not self.flusher.stop():
+            return
+        try:
+            self._drain()
+        except Exception:
+            self.app.logger.exception("Final write-behind flush failed")
+
+
+class SubmissionQueue:
+    """
+    Write-behind pipeline for public form submissions.
+
+    Disabled by default: submit() then adds and commits in the request like before.
+    With INGEST_ENABLED, submit() only appends to the local journal and a background
+    thread bulk-inserts journalled rows every INGEST_FLUSH_INTERVAL seconds or as
+    soon as INGEST_BATCH_SIZE rows are waiting.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("INGEST_ENABLED", os.getenv("INGEST_ENABLED", "0") == "1")
+        app.config.setdefault("INGEST_JOURNAL", os.getenv("INGEST_JOURNAL", os.path.join(app.instance_path, "ingest.journal")))
+        app.config.setdefault("INGEST_BATCH_SIZE", int(os.getenv("INGEST_BATCH_SIZE", 200)))
+        app.config.setdefault("INGEST_FLUSH_INTERVAL", float(os.getenv("INGEST_FLUSH_INTERVAL", 1.0)))
+        app.config.setdefault("INGEST_CLAIM_TIMEOUT", int(os.getenv("INGEST_CLAIM_TIMEOUT", 60)))
+
+        state = app.extensions["ingest"] = _QueueState(app)
+        if state.enabled:
+            # Replays whatever a previous (possibly crashed) process left behind
+            app.before_request(state.start)
+
+    @property
+    def _state(self):
+        return current_app.extensions["ingest"]
+
+    @property
+    def enabled(self):
+        return self._state.enabled
+
+    @property
+    def batch_size(self):
+        return self._state.batch_size
+
+    def submit(self, kind, fields):
+        self._state.submit(kind, fields)
+
+    def depth(self):
+        return self._state.depth()
+
+    def stats(self):
+        return self._state.stats()
+
+    def flush(self):
+        return self._state.flush()
+
+    def shutdown(self):
+        self._state.shutdown()
@@ -0,0 +1,112 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete, func, insert, select
+
+from cache import LRUBackend
+from ingest import submissions_inserting
+from model import db, User, InquiryOption
+
+# Comma-joined multi-select columns on User that get indexed option rows
+FIELDS = ("project_type", "features", "addons")
+
+VALUE_LENGTH = InquiryOption.__table__.c.value.type.length
+
+
+def split_options(text):
+    """Values of a ", ".join(...)-ed multi-select column, deduplicated."""
+    values = (value.strip()[:VALUE_LENGTH] for value in (text or "").split(","))
+    return list(dict.fromkeys(value for value in values if value))
+
+
+def option_rows(inquiry_id, fields):
+    return [
+        dict(inquiry_id=inquiry_id, field=field, value=value)
+        for field in FIELDS
+        for value in split_options(fields.get(field))
+    ]
+
+
+class InquiryOptionIndex:
+    """
+    Keeps inquiry_options in step with the comma-joined project_type, features
+    and addons columns, which stay the display copy. Rows are written in the
+    inserting transaction via submissions_inserting; inquiries stored before
+    the table existed are filled with `flask inquiry-options backfill`.
+    choices() gives each value's inquiry count for the admin filters.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("INQUIRY_OPTIONS_BATCH_SIZE", 1000)
+
+        submissions_inserting.connect(self.on_inserting, sender="inquiry", weak=False)
+        # The app's cached choices() per field
+        app.extensions["inquiry_options"] = LRUBackend(maxsize=len(FIELDS), ttl=300)
+
+        @app.cli.group("inquiry-options")
+        def options_group():
+            """Indexed project type / feature / add-on values."""
+
+        @options_group.command("backfill")
+        @click.option("--batch-size", type=int, default=None, help="Inquiries per transaction.")
+        @with_appcontext
+        def backfill_command(batch_size):
+            """Rebuild inquiry_options from the comma-joined columns."""
+            total = self.backfill(batch_size, progress=lambda done: click.echo(f"{done} inquiries indexed"))
+            click.echo(f"Backfilled options for {total} inquiries.")
+
+    def on_inserting(self, kind, rows):
+        options = [option for row in rows for option in option_rows(row["id"], row)]
+        if options:
+            db.session.execute(insert(InquiryOption), options)
+
+    # ---------- BACKFILL ----------
+    def backfill(self, batch_size=None, progress=None):
+        """Re-derive option rows for every inquiry, one id range per commit."""
+        batch_size = batch_size or current_app.config["INQUIRY_OPTIONS_BATCH_SIZE"]
+        columns = [User.id] + [getattr(User, field) for field in FIELDS]
+        last_id, total = 0, 0
+
+        while True:
+            batch = db.session.execute(
+                select(*columns).where(User.id > last_id).order_by(User.id).limit(batch_size)
+            ).all()
+            if not batch:
+                break
+
+            ids = [row.id for row in batch]
+            options = [option for row in batch for option in option_rows(row.id, row._mapping)]
+            db.session.execute(delete(InquiryOption).where(InquiryOption.inquiry_id.in_(ids)))
+            if options:
+                db.session.execute(insert(InquiryOption), options)
+            db.session.commit()
+
+            last_id = ids[-1]
+            total += len(batch)
+            if progress:
+                progress(total)
+
+        current_app.extensions["inquiry_options"].bump_generation()
+        return total
+
+    # ---------- READ ----------
+    def choices(self, field):
+        """[(value, inquiry count), ...] for one field, most requested first."""
+        choices = current_app.extensions["inquiry_options"]
+        cached = choices.get(field)
+        if cached is None:
+            count = func.count(InquiryOption.inquiry_id)
+            cached = [
+                tuple(row) for row in db.session.execute(
+                    select(InquiryOption.value, count)
+                    .where(InquiryOption.field == field)
+                    .group_by(InquiryOption.value)
+                    .order_by(count.desc(), InquiryOption.value)
+                ).all()
+            ]
+            choices.set(field, cached)
+        return cached
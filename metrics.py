@@ -0,0 +1,207 @@
+import hmac
+import os
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_login import current_user
+from sqlalchemy import event
+
+# Upper bounds in seconds, as in Prometheus' default buckets
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Fixed-bucket histogram; quantiles are interpolated within a bucket."""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = BUCKETS[i] if BUCKETS[i] != float("inf") else lower
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return BUCKETS[-2]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.duration = Histogram()
+        self.errors = 0
+        self.queries = 0
+        self.query_time = 0.0
+
+
+class _MetricsState:
+    """One app's endpoint stats, kept in app.extensions["metrics"]."""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+
+
+class RequestMetrics:
+    """
+    Per-endpoint request latency and SQL usage for this worker process.
+
+    Each request's wall time and its queries (count and time, via engine events)
+    are recorded per endpoint. With METRICS_SERVER_TIMING they are also sent
+    back in a Server-Timing header, to signed-in admins only. Queries
+    slower than METRICS_SLOW_QUERY_MS are logged. /admin/metrics shows the
+    percentiles; /metrics serves the Prometheus text format to requests bearing
+    METRICS_TOKEN (it is off when no token is set).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("METRICS_ENABLED", os.getenv("METRICS_ENABLED", "1") == "1")
+        # Off by default: the header shows DB and render timings to whoever asks
+        app.config.setdefault("METRICS_SERVER_TIMING", os.getenv("METRICS_SERVER_TIMING", "0") == "1")
+        app.config.setdefault("METRICS_SLOW_QUERY_MS", float(os.getenv("METRICS_SLOW_QUERY_MS", 200)))
+        app.config.setdefault("METRICS_TOKEN", os.getenv("METRICS_TOKEN"))
+
+        if app.config["METRICS_ENABLED"]:
+            app.before_request(self._start)
+            app.after_request(self._finish)
+        app.extensions["metrics"] = _MetricsState()
+
+    @property
+    def _state(self):
+        return current_app.extensions["metrics"]
+
+    # ---------- REQUEST TIMER ----------
+    def _start(self):
+        g._metrics_start = time.perf_counter()
+        g._metrics_queries = 0
+        g._metrics_query_time = 0.0
+
+    def _finish(self, response):
+        start = g.pop("_metrics_start", None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        queries = g.pop("_metrics_queries", 0)
+        query_time = g.pop("_metrics_query_time", 0.0)
+
+        endpoint = request.endpoint or "<unmatched>"
+        state = self._state
+        with state.lock:
+            stats = state.endpoints.get(endpoint)
+            if stats is None:
+                stats = state.endpoints[endpoint] = EndpointStats()
+            stats.duration.observe(elapsed)
+            stats.queries += queries
+            stats.query_time += query_time
+            if response.status_code >= 500:
+                stats.errors += 1
+
+        if current_app.config["METRICS_SERVER_TIMING"] and current_user.is_authenticated:
+            response.headers.add(
+                "Server-Timing",
+                f'app;dur={elapsed * 1000:.1f}, db;dur={query_time * 1000:.1f};desc="{queries} queries"'
+            )
+        return response
+
+    # ---------- SQL HOOKS ----------
+    def attach(self, engine):
+        """Count an engine's queries; call with the engine's app context pushed."""
+        threshold = current_app.config["METRICS_SLOW_QUERY_MS"] / 1000.0
+        logger = current_app.logger
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+
+            if has_request_context() and "_metrics_start" in g:
+                g._metrics_queries += 1
+                g._metrics_query_time += elapsed
+
+            if threshold and elapsed >= threshold:
+                where = request.endpoint if has_request_context() else "background"
+                logger.warning("Slow query (%.1f ms, %s): %s", elapsed * 1000, where, " ".join(statement.split())[:500])
+
+    # ---------- REPORTS ----------
+    def summary(self):
+        state = self._state
+        with state.lock:
+            rows = []
+            for endpoint, stats in sorted(state.endpoints.items()):
+                count = stats.duration.count
+                rows.append({
+                    "endpoint": endpoint,
+                    "requests": count,
+                    "errors": stats.errors,
+                    **{f"p{int(q * 100)}_ms": round(stats.duration.quantile(q) * 1000, 1) for q in QUANTILES},
+                    "avg_ms": round(stats.duration.sum / count * 1000, 1) if count else 0.0,
+                    "avg_queries": round(stats.queries / count, 1) if count else 0.0,
+                    "avg_db_ms": round(stats.query_time / count * 1000, 1) if count else 0.0,
+                })
+        return rows
+
+    def prometheus(self):
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by endpoint.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        counters = {
+            "http_request_errors_total": ("Responses with a 5xx status.", []),
+            "db_queries_total": ("SQL statements executed by requests.", []),
+            "db_query_duration_seconds_total": ("Time spent in SQL by requests.", []),
+        }
+
+        state = self._state
+        with state.lock:
+            for endpoint, stats in sorted(state.endpoints.items()):
+                label = endpoint.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS, stats.duration.counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'http_request_duration_seconds_bucket{{endpoint="{label}",le="{le}"}} {cumulative}')
+                lines.append(f'http_request_duration_seconds_sum{{endpoint="{label}"}} {stats.duration.sum}')
+                lines.append(f'http_request_duration_seconds_count{{endpoint="{label}"}} {stats.duration.count}')
+
+                counters["http_request_errors_total"][1].append(f'{{endpoint="{label}"}} {stats.errors}')
+                counters["db_queries_total"][1].append(f'{{endpoint="{label}"}} {stats.queries}')
+                counters["db_query_duration_seconds_total"][1].append(f'{{endpoint="{label}"}} {stats.query_time}')
+
+        for name, (help_text, samples) in counters.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(name + sample for sample in samples)
+
+        lines.append("# HELP process_start_time_seconds Start time of this worker.")
+        lines.append("# TYPE process_start_time_seconds gauge")
+        lines.append(f"process_start_time_seconds {state.started_at}")
+        return "\n".join(lines) + "\n"
+
+    def authorized(self):
+        token = current_app.config["METRICS_TOKEN"]
+        supplied = request.headers.get("Authorization", "")
+        return bool(token) and hmac.compare_digest(supplied.encode("utf-8"), f"Bearer {token}".encode("utf-8"))
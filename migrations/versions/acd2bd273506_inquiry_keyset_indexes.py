@@ -0,0 +1,45 @@
+"""inquiry keyset and search indexes
+
+Revision ID: acd2bd273506
+Revises: 2d25f28fad0b
+Create Date: 2026-10-18 17:45:12.204117
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'acd2bd273506'
+down_revision = '2d25f28fad0b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Keyset pagination: newest first, optionally within a contacted/pending filter
+    op.create_index('ix_project_inquiries_created_at_id', 'project_inquiries', ['created_at', 'id'])
+    op.create_index('ix_project_inquiries_is_contacted_created_at_id', 'project_inquiries', ['is_contacted', 'created_at', 'id'])
+
+    if bind.dialect.name == 'postgresql':
+        # Trigram GIN indexes serve the ILIKE '%term%' search
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_project_inquiries_full_name_trgm', 'project_inquiries', ['full_name'],
+            postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'}
+        )
+        op.create_index(
+            'ix_project_inquiries_email_trgm', 'project_inquiries', ['email'],
+            postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}
+        )
+    # Elsewhere a b-tree can't serve ILIKE '%term%', so the search just scans
+
+
+def downgrade():
+    # IF EXISTS: databases upgraded by an earlier version of this revision may
+    # have plain b-tree *_trgm indexes on non-PostgreSQL backends
+    op.execute('DROP INDEX IF EXISTS ix_project_inquiries_email_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_project_inquiries_full_name_trgm')
+    op.drop_index('ix_project_inquiries_is_contacted_created_at_id', table_name='project_inquiries')
+    op.drop_index('ix_project_inquiries_created_at_id', table_name='project_inquiries')
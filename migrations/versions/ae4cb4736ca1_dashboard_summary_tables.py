@@ -0,0 +1,54 @@
+"""dashboard summary tables
+
+Revision ID: ae4cb4736ca1
+Revises: acd2bd273506
+Create Date: 2026-10-18 18:02:41.518230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ae4cb4736ca1'
+down_revision = 'acd2bd273506'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('dashboard_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('inquiry_daily_counts',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+    # Seed from the existing rows (same queries as DashboardStats.reconcile)
+    op.execute("""
+        INSERT INTO dashboard_counters (name, value)
+        SELECT 'inquiries_total', COUNT(*) FROM project_inquiries
+        UNION ALL SELECT 'inquiries_contacted', COUNT(*) FROM project_inquiries WHERE is_contacted = true
+        UNION ALL SELECT 'contacts_total', COUNT(*) FROM contact_messages
+        UNION ALL SELECT 'contacts_unread', COUNT(*) FROM contact_messages WHERE is_read = false
+        UNION ALL SELECT 'reviews_total', COUNT(*) FROM reviews
+    """)
+    op.execute("""
+        INSERT INTO dashboard_counters (name, value)
+        SELECT 'reviews_rating_' || rating, COUNT(*) FROM reviews
+        WHERE rating BETWEEN 1 AND 5 GROUP BY rating
+    """)
+    op.execute("""
+        INSERT INTO inquiry_daily_counts (day, count)
+        SELECT date(created_at), COUNT(*) FROM project_inquiries
+        WHERE created_at IS NOT NULL GROUP BY date(created_at)
+    """)
+
+
+def downgrade():
+    op.drop_table('inquiry_daily_counts')
+    op.drop_table('dashboard_counters')
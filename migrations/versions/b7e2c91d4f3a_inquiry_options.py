@@ -0,0 +1,33 @@
+"""inquiry options table
+
+Revision ID: b7e2c91d4f3a
+Revises: ae4cb4736ca1
+Create Date: 2026-10-18 19:12:37.604518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c91d4f3a'
+down_revision = 'ae4cb4736ca1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are filled in batches afterwards by `flask inquiry-options backfill`
+    op.create_table('inquiry_options',
+    sa.Column('inquiry_id', sa.Integer(), nullable=False),
+    sa.Column('field', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['inquiry_id'], ['project_inquiries.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('inquiry_id', 'field', 'value')
+    )
+    op.create_index('ix_inquiry_options_field_value_inquiry_id', 'inquiry_options', ['field', 'value', 'inquiry_id'])
+
+
+def downgrade():
+    op.drop_index('ix_inquiry_options_field_value_inquiry_id', table_name='inquiry_options')
+    op.drop_table('inquiry_options')
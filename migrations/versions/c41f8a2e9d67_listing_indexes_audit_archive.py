@@ -0,0 +1,47 @@
+"""listing indexes and audit archive
+
+Revision ID: c41f8a2e9d67
+Revises: b7e2c91d4f3a
+Create Date: 2026-10-18 19:48:05.117342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f8a2e9d67'
+down_revision = 'b7e2c91d4f3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Newest-first listings and the home page testimonials sort by created_at
+    op.create_index('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id'])
+    op.create_index('ix_contact_messages_created_at_id', 'contact_messages', ['created_at', 'id'])
+    op.create_index('ix_contact_messages_is_read_created_at_id', 'contact_messages', ['is_read', 'created_at', 'id'])
+    op.create_index('ix_reviews_created_at_id', 'reviews', ['created_at', 'id'])
+    op.create_index('ix_reviews_rating_created_at_id', 'reviews', ['rating', 'created_at', 'id'])
+
+    # Destination of `flask audit archive` (AUDIT_ARCHIVE=table)
+    op.create_table('audit_logs_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('admin_email', sa.String(length=120), nullable=False),
+    sa.Column('action', sa.String(length=255), nullable=False),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_logs_archive_created_at', 'audit_logs_archive', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_audit_logs_archive_created_at', table_name='audit_logs_archive')
+    op.drop_table('audit_logs_archive')
+
+    op.drop_index('ix_reviews_rating_created_at_id', table_name='reviews')
+    op.drop_index('ix_reviews_created_at_id', table_name='reviews')
+    op.drop_index('ix_contact_messages_is_read_created_at_id', table_name='contact_messages')
+    op.drop_index('ix_contact_messages_created_at_id', table_name='contact_messages')
+    op.drop_index('ix_audit_logs_created_at_id', table_name='audit_logs')
@@ -1,9 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy.orm import query_expression
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+import hashlib
 
-db = SQLAlchemy()
+from replica import RoutingSession
+
+# RoutingSession sends @replica.reads views to the optional read replica
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 class Admin(UserMixin, db.Model):
     __tablename__ = "admins"
@@ -32,6 +37,16 @@ class Admin(UserMixin, db.Model):
     def check_password(self, raw_password):
         return check_password_hash(self.password_hash, raw_password)
 
+    @property
+    def credential_version(self):
+        # Changes whenever the email or password does
+        digest = hashlib.sha256(f"{self.email}\0{self.password_hash}".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def get_id(self):
+        # Versioned so existing sessions end when the credentials change
+        return f"{self.id}:{self.credential_version}"
+
 class User(UserMixin, db.Model):
     __tablename__="project_inquiries"
     id = db.Column(db.Integer, primary_key=True)
@@ -58,6 +73,30 @@ class User(UserMixin, db.Model):
     is_contacted = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
 
+    # Indexed copy of project_type / features / addons (see inquiry_options.py)
+    options = db.relationship("InquiryOption", cascade="all, delete-orphan", passive_deletes=True)
+
+    # Keyset pagination indexes; the trigram search indexes are PostgreSQL-only
+    # and live in migration acd2bd273506
+    __table_args__ = (
+        db.Index("ix_project_inquiries_created_at_id", "created_at", "id"),
+        db.Index("ix_project_inquiries_is_contacted_created_at_id", "is_contacted", "created_at", "id"),
+    )
+
+class InquiryOption(db.Model):
+    __tablename__ = "inquiry_options"
+
+    # One row per selected value, e.g. ("features", "Admin Dashboard")
+    inquiry_id = db.Column(
+        db.Integer, db.ForeignKey("project_inquiries.id", ondelete="CASCADE"), primary_key=True
+    )
+    field = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(100), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_inquiry_options_field_value_inquiry_id", "field", "value", "inquiry_id"),
+    )
+
 class ContactMessage(db.Model):
     __tablename__ = "contact_messages"
 
@@ -72,6 +111,12 @@ class ContactMessage(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_read = db.Column(db.Boolean, default=False)
 
+    # Keyset pagination for /admin/contact-messages, with and without is_read
+    __table_args__ = (
+        db.Index("ix_contact_messages_created_at_id", "created_at", "id"),
+        db.Index("ix_contact_messages_is_read_created_at_id", "is_read", "created_at", "id"),
+    )
+
 class Review(db.Model):
     __tablename__ = "reviews"
 
@@ -82,6 +127,16 @@ class Review(db.Model):
     message = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Filled by listing queries with a truncated message (see admin_reviews)
+    message_preview = query_expression()
+
+    # Keyset pagination for /admin/reviews; (rating, created_at, id) also serves
+    # the rating filter and the home page testimonials
+    __table_args__ = (
+        db.Index("ix_reviews_created_at_id", "created_at", "id"),
+        db.Index("ix_reviews_rating_created_at_id", "rating", "created_at", "id"),
+    )
+
 class AuditLog(db.Model):
     __tablename__ = "audit_logs"
 
@@ -92,3 +147,33 @@ class AuditLog(db.Model):
     ip_address = db.Column(db.String(45))
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Newest-first listing, and the oldest-first scan of `flask audit archive`
+    __table_args__ = (
+        db.Index("ix_audit_logs_created_at_id", "created_at", "id"),
+    )
+
+class AuditLogArchive(db.Model):
+    __tablename__ = "audit_logs_archive"
+
+    # Rows moved out of audit_logs by AuditRetention, ids kept
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+
+    admin_email = db.Column(db.String(120), nullable=False)
+    action = db.Column(db.String(255), nullable=False)
+    ip_address = db.Column(db.String(45))
+
+    created_at = db.Column(db.DateTime, index=True)
+
+class DashboardCounter(db.Model):
+    __tablename__ = "dashboard_counters"
+
+    # e.g. inquiries_total, contacts_unread, reviews_rating_5 (see stats.py)
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+class InquiryDailyCount(db.Model):
+    __tablename__ = "inquiry_daily_counts"
+
+    day = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
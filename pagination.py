@@ -0,0 +1,104 @@
+import base64
+import json
+from datetime import datetime
+
+from flask import abort
+from sqlalchemy import func, text, tuple_
+
+from cache import LRUBackend
+from model import db
+
+# Filtered totals are cached briefly instead of running COUNT(*) per page view
+_count_cache = LRUBackend(maxsize=256, ttl=60)
+
+
+# ---------- CURSORS ----------
+def encode_cursor(created_at, row_id):
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Return (created_at, id), or None when there is no cursor. A tampered
+    cursor, or one without a created_at, is a 400: restarting from the first
+    page instead would send a client walking the pages round in a loop.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if created_at is None:
+            raise ValueError("cursor has no created_at")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        abort(400, description="Invalid page cursor.")
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def keyset_paginate(query, model, per_page, after=None, before=None):
+    """
+    Newest-first pagination on (created_at, id).
+
+    `after` moves to older rows, `before` to newer ones. Each page is a single
+    index range scan of per_page + 1 rows, so deep pages cost the same as page 1.
+    """
+    key = tuple_(model.created_at, model.id)
+    after, before = decode_cursor(after), decode_cursor(before)
+
+    if before is not None:
+        rows = query.filter(key > before).order_by(
+            model.created_at.asc(), model.id.asc()
+        ).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        rows = list(reversed(rows[:per_page]))
+        has_newer, has_older = has_more, True
+    else:
+        if after is not None:
+            query = query.filter(key < after)
+        rows = query.order_by(
+            model.created_at.desc(), model.id.desc()
+        ).limit(per_page + 1).all()
+        has_older = len(rows) > per_page
+        rows = rows[:per_page]
+        has_newer = after is not None
+
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if rows and has_older else None
+    prev_cursor = encode_cursor(rows[0].created_at, rows[0].id) if rows and has_newer else None
+    return KeysetPage(rows, next_cursor, prev_cursor)
+
+
+# ---------- TOTALS ----------
+def approximate_count(query, model, cache_key, filtered=True):
+    """
+    Total for the listing header. Unfiltered PostgreSQL tables use the planner's
+    row estimate; everything else is an exact COUNT cached for a minute.
+    """
+    if not filtered and db.engine.dialect.name == "postgresql":
+        estimate = db.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+            {"table": model.__tablename__}
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return estimate, True
+
+    count = _count_cache.get(cache_key)
+    if count is None:
+        count = query.with_entities(func.count(model.id)).order_by(None).scalar()
+        _count_cache.set(cache_key, count)
+    return count, False
@@ -0,0 +1,183 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from functools import wraps
+
+import click
+from flask import current_app, request, make_response, url_for
+
+from cache import personal_session
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants are built without it
+    brotli = None
+
+
+SUFFIXES = {"identity": "", "gzip": ".gz", "br": ".br"}
+
+
+class Page:
+    """One pre-rendered route: identity bytes plus compressed variants."""
+
+    def __init__(self, body, status=200, mimetype="text/html", variants=None):
+        self.status = status
+        self.mimetype = mimetype
+        self.variants = {"identity": body}
+        if variants:
+            self.variants.update(variants)
+        else:
+            self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body, quality=11)
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etags = {encoding: f"{digest}-{encoding}" for encoding in self.variants}
+
+    def negotiate(self, accept_encodings):
+        best, best_quality = "identity", 0
+        for encoding in ("br", "gzip"):
+            quality = accept_encodings[encoding]
+            if encoding in self.variants and quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+
+class _PagesState:
+    """One app's rendered pages, kept in app.extensions["static_pages"]."""
+
+    def __init__(self, app):
+        self.enabled = app.config["PRERENDER_ENABLED"]
+        self.max_hosts = app.config["PRERENDER_MAX_HOSTS"]
+        self.pages = {}
+        self.lock = threading.Lock()
+
+
+class StaticPages:
+    """
+    Serves purely static marketing pages from pre-rendered byte buffers.
+
+    Pages are rendered once per host (or loaded from PRERENDER_DIR when built with
+    `flask prerender`) through the normal view and template, so the HTML is the
+    same; later requests skip Jinja entirely. Signed-in requests and those with
+    pending flash messages fall through to the view, since the footer renders
+    the flashes.
+    """
+
+    def __init__(self, app=None):
+        # Filled by @prerendered at import time, so shared by every app
+        self.endpoints = {}
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PRERENDER_ENABLED", os.getenv("PRERENDER_ENABLED", "1") == "1")
+        app.config.setdefault("PRERENDER_DIR", os.getenv("PRERENDER_DIR", os.path.join(app.instance_path, "prerendered")))
+        app.config.setdefault("PRERENDER_MAX_HOSTS", int(os.getenv("PRERENDER_MAX_HOSTS", 4)))
+        app.config.setdefault("SITE_URL", os.getenv("SITE_URL", "http://localhost:5000/"))
+
+        app.extensions["static_pages"] = _PagesState(app)
+
+        @app.cli.command("prerender")
+        def prerender_command():
+            """Render static pages for SITE_URL into PRERENDER_DIR."""
+            written = self.build(app.config["SITE_URL"], app.config["PRERENDER_DIR"])
+            for endpoint, path in written:
+                click.echo(f"{endpoint} -> {path}")
+
+    def prerendered(self, view):
+        self.endpoints[view.__name__] = view
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self._state.enabled or request.method != "GET" or personal_session():
+                return view(*args, **kwargs)
+
+            page = self._page(request.endpoint, request.host_url)
+            if page is None:
+                return view(*args, **kwargs)
+
+            encoding = page.negotiate(request.accept_encodings)
+
+            response = make_response(page.variants[encoding], page.status)
+            response.mimetype = page.mimetype
+            response.set_etag(page.etags[encoding])
+            response.vary.add("Accept-Encoding")
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+            return response.make_conditional(request)
+        return wrapper
+
+    @property
+    def _state(self):
+        return current_app.extensions["static_pages"]
+
+    # ---------- RENDERING ----------
+    def _page(self, endpoint, host_url):
+        state = self._state
+        key = (endpoint, host_url)
+        page = state.pages.get(key)
+        if page is None:
+            # Don't let arbitrary Host headers grow the table without bound
+            if len({host for _, host in state.pages} | {host_url}) > state.max_hosts:
+                return None
+            with state.lock:
+                page = state.pages.get(key) or self._load(endpoint, host_url) or self.render(endpoint, host_url)
+                state.pages[key] = page
+        return page
+
+    def render(self, endpoint, host_url):
+        app = current_app._get_current_object()
+        with app.test_request_context(base_url=host_url):
+            path = url_for(endpoint)
+        with app.test_request_context(path, base_url=host_url):
+            response = make_response(self.endpoints[endpoint]())
+        return Page(response.get_data(), response.status_code, response.mimetype)
+
+    def rebuild(self):
+        state = self._state
+        with state.lock:
+            state.pages.clear()
+
+    # ---------- BUILD ARTIFACTS ----------
+    def build(self, host_url, directory):
+        os.makedirs(directory, exist_ok=True)
+        manifest, written = {}, []
+
+        for endpoint in self.endpoints:
+            page = self.render(endpoint, host_url)
+            manifest[endpoint] = {"status": page.status, "mimetype": page.mimetype}
+            for encoding, body in page.variants.items():
+                path = os.path.join(directory, f"{endpoint}.html{SUFFIXES[encoding]}")
+                with open(path, "wb") as fh:
+                    fh.write(body)
+                written.append((endpoint, path))
+
+        with open(os.path.join(directory, "manifest.json"), "w") as fh:
+            json.dump({"host_url": host_url, "pages": manifest}, fh, indent=2)
+
+        self.rebuild()
+        return written
+
+    def _load(self, endpoint, host_url):
+        directory = current_app.config["PRERENDER_DIR"]
+        try:
+            with open(os.path.join(directory, "manifest.json")) as fh:
+                manifest = json.load(fh)
+            if manifest["host_url"] != host_url or endpoint not in manifest["pages"]:
+                return None
+            variants = {}
+            for encoding, suffix in SUFFIXES.items():
+                path = os.path.join(directory, f"{endpoint}.html{suffix}")
+                if os.path.exists(path):
+                    with open(path, "rb") as fh:
+                        variants[encoding] = fh.read()
+            body = variants.pop("identity")
+        except (OSError, ValueError, KeyError):
+            return None
+
+        meta = manifest["pages"][endpoint]
+        return Page(body, meta["status"], meta["mimetype"], variants)
@@ -0,0 +1,45 @@
+from sqlalchemy import select
+
+from model import User, InquiryOption
+
+# /admin/inquiries option filter parameter -> InquiryOption.field
+OPTION_FILTERS = {
+    "project_type": "project_type",
+    "feature": "features",
+    "addon": "addons",
+}
+
+
+def option_filters(args):
+    """The option filter values in `args` (request.args or a dict), "" when unset."""
+    return {param: args.get(param) or "" for param in OPTION_FILTERS}
+
+
+def inquiry_query(search="", status="", options=None):
+    """User.query with the /admin/inquiries search, status and option filters applied."""
+    query = User.query
+
+    # 🔍 Search by name or email (trigram-indexed on PostgreSQL)
+    if search:
+        query = query.filter(
+            (User.full_name.ilike(f"%{search}%")) |
+            (User.email.ilike(f"%{search}%"))
+        )
+
+    # 🟢 Filter by contacted status
+    if status == "contacted":
+        query = query.filter(User.is_contacted == True)
+    elif status == "pending":
+        query = query.filter(User.is_contacted == False)
+
+    # 🧩 Requested project type / feature / add-on, via the inquiry_options index
+    for param, value in (options or {}).items():
+        if value:
+            query = query.filter(User.id.in_(
+                select(InquiryOption.inquiry_id).where(
+                    InquiryOption.field == OPTION_FILTERS[param],
+                    InquiryOption.value == value
+                )
+            ))
+
+    return query
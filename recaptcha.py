@@ -0,0 +1,194 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+VERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+
+
+# ---------- BACKENDS ----------
+class GoogleBackend:
+    """Talks to Google's siteverify endpoint over one pooled keep-alive session."""
+
+    def __init__(self, secret_key, connect_timeout=2.0, read_timeout=3.0, pool_size=10, **_):
+        self.secret_key = secret_key
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+
+    def verify(self, token, remote_ip=None):
+        data = {"secret": self.secret_key, "response": token}
+        if remote_ip:
+            data["remoteip"] = remote_ip
+
+        response = self.session.post(VERIFY_URL, data=data, timeout=self.timeout)
+        return bool(response.json().get("success"))
+
+    def close(self):
+        self.session.close()
+
+
+class StubBackend:
+    """Offline backend for local runs and load tests: accepts any non-empty token."""
+
+    def __init__(self, latency=0.0, **_):
+        self.latency = latency
+
+    def verify(self, token, remote_ip=None):
+        if self.latency:
+            time.sleep(self.latency)
+        return bool(token) and token != "fail"
+
+    def close(self):
+        pass
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "stub": StubBackend,
+}
+
+
+def register_backend(name, backend_cls):
+    BACKENDS[name] = backend_cls
+
+
+# ---------- VERIFIER ----------
+class _VerifierState:
+    """One app's backend, thread pool and token cache, kept in app.extensions["recaptcha"]."""
+
+    def __init__(self, backend, executor, cache_ttl, cache_size, logger):
+        self.backend = backend
+        self.executor = executor
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.logger = logger
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---------- TOKEN CACHE ----------
+    def _cached(self, token):
+        with self._lock:
+            entry = self._cache.get(token)
+            if entry is None:
+                return None
+            result, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._cache[token]
+                return None
+            self._cache.move_to_end(token)
+            return result
+
+    def _remember(self, token, result):
+        with self._lock:
+            self._cache[token] = (result, time.monotonic() + self.cache_ttl)
+            self._cache.move_to_end(token)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ---------- VERIFY ----------
+    def verify(self, token, remote_ip=None):
+        if not token:
+            return False
+
+        cached = self._cached(token)
+        if cached is not None:
+            return cached
+
+        try:
+            result = self.backend.verify(token, remote_ip)
+        except (requests.RequestException, ValueError) as exc:
+            # Fail closed, but don't cache: the user may retry the same token.
+            self.logger.warning("reCAPTCHA verification failed: %s", exc)
+            return False
+
+        if not result:
+            self._remember(token, result)
+        return result
+
+
+class RecaptchaVerifier:
+    """
+    Shared reCAPTCHA verification service.
+
+    Rejected tokens are cached for a short window so a re-POST of the same
+    form does not hit Google twice. Accepted tokens are not: Google only
+    accepts a token once, and a cached success would let it be replayed.
+    With RECAPTCHA_WORKERS > 0, submit() runs the check on a thread pool so
+    the view can parse the form meanwhile.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RECAPTCHA_SECRET_KEY", os.getenv("RECAPTCHA_SECRET_KEY"))
+        app.config.setdefault("RECAPTCHA_BACKEND", os.getenv("RECAPTCHA_BACKEND", "google"))
+        app.config.setdefault("RECAPTCHA_CONNECT_TIMEOUT", float(os.getenv("RECAPTCHA_CONNECT_TIMEOUT", 2.0)))
+        app.config.setdefault("RECAPTCHA_READ_TIMEOUT", float(os.getenv("RECAPTCHA_READ_TIMEOUT", 3.0)))
+        app.config.setdefault("RECAPTCHA_POOL_SIZE", int(os.getenv("RECAPTCHA_POOL_SIZE", 10)))
+        app.config.setdefault("RECAPTCHA_CACHE_TTL", int(os.getenv("RECAPTCHA_CACHE_TTL", 120)))
+        app.config.setdefault("RECAPTCHA_CACHE_SIZE", int(os.getenv("RECAPTCHA_CACHE_SIZE", 1024)))
+        app.config.setdefault("RECAPTCHA_WORKERS", int(os.getenv("RECAPTCHA_WORKERS", 0)))
+        app.config.setdefault("RECAPTCHA_STUB_LATENCY", float(os.getenv("RECAPTCHA_STUB_LATENCY", 0.0)))
+
+        backend_name = app.config["RECAPTCHA_BACKEND"]
+        if backend_name not in BACKENDS:
+            raise ValueError(f"Unknown RECAPTCHA_BACKEND: {backend_name!r}")
+
+        backend = BACKENDS[backend_name](
+            secret_key=app.config["RECAPTCHA_SECRET_KEY"],
+            connect_timeout=app.config["RECAPTCHA_CONNECT_TIMEOUT"],
+            read_timeout=app.config["RECAPTCHA_READ_TIMEOUT"],
+            pool_size=app.config["RECAPTCHA_POOL_SIZE"],
+            latency=app.config["RECAPTCHA_STUB_LATENCY"],
+        )
+
+        workers = app.config["RECAPTCHA_WORKERS"]
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="recaptcha") if workers > 0 else None
+
+        app.extensions["recaptcha"] = _VerifierState(
+            backend,
+            executor,
+            app.config["RECAPTCHA_CACHE_TTL"],
+            app.config["RECAPTCHA_CACHE_SIZE"],
+            app.logger
+        )
+
+    @property
+    def _state(self):
+        return current_app.extensions["recaptcha"]
+
+    # ---------- VERIFY ----------
+    def verify(self, token, remote_ip=None):
+        return self._state.verify(token, remote_ip)
+
+    def submit(self, token, remote_ip=None):
+        """Start verification and return a Future; runs inline without a pool."""
+        state = self._state
+        if state.executor is not None:
+            return state.executor.submit(state.verify, token, remote_ip)
+
+        future = Future()
+        future.set_result(state.verify(token, remote_ip))
+        return future
+
+    async def verify_async(self, token, remote_ip=None):
+        state = self._state
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(state.executor, state.verify, token, remote_ip)
+
+    def shutdown(self):
+        state = self._state
+        if state.executor is not None:
+            state.executor.shutdown(wait=False)
+        state.backend.close()
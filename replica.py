@@ -0,0 +1,148 @@
+import os
+import time
+from functools import wraps
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.exc import DBAPIError
+
+BIND_KEY = "replica"
+
+
+class RoutingSession(Session):
+    """
+    db.session class that sends the reads of @replica.reads views to the
+    replica bind. Flushes and INSERT/UPDATE/DELETE always use the primary,
+    and mark the request as having written (see ReadReplica.engine_for).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            replica = current_app.extensions.get("replica")
+            if replica is not None:
+                engine = replica.engine_for(self._db.engines, clause, self._flushing)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+class _ReplicaState:
+    """One app's replica routing and health, kept in app.extensions["replica"]."""
+
+    def __init__(self, app):
+        self.config = app.config
+        self.logger = app.logger
+        self.enabled = bool(app.config["REPLICA_DATABASE_URI"])
+        self.fallbacks = 0
+        self.down_until = 0.0
+
+    def engine_for(self, engines, clause, flushing):
+        if not has_request_context():
+            return None
+
+        if flushing or getattr(clause, "is_dml", False):
+            g._replica_wrote = True
+            return None
+
+        if (
+            not g.get("_replica_reads")
+            or g.get("_replica_wrote")
+            or request.cookies.get(self.config["REPLICA_STICKY_COOKIE"])
+            or not self.available()
+        ):
+            return None
+
+        g._replica_used = True
+        return engines.get(BIND_KEY)
+
+    def available(self):
+        return self.enabled and time.monotonic() >= self.down_until
+
+    def mark_down(self, exc):
+        self.down_until = time.monotonic() + self.config["REPLICA_RETRY_AFTER"]
+        self.fallbacks += 1
+        self.logger.warning("Read replica failed, using the primary for %ss: %s",
+                            self.config["REPLICA_RETRY_AFTER"], exc)
+
+
+class ReadReplica:
+    """
+    Optional read-only database for listing views.
+
+    With REPLICA_DATABASE_URI set it becomes the "replica" bind, and the
+    SELECTs of views decorated with @replica.reads go there. Anything that
+    writes, the rest of a request that has written, and the next
+    REPLICA_STICKY_SECONDS of requests from the same browser (a cookie) read
+    the primary, so a submitted form or an admin action is visible
+    straight away despite replication lag. When the replica errors, the view
+    is re-run on the primary and the replica is skipped for
+    REPLICA_RETRY_AFTER seconds.
+
+    Must be initialised before db.init_app(), which creates the bind engines.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("REPLICA_DATABASE_URI", os.getenv("DATABASE_REPLICA_URL") or None)
+        app.config.setdefault("REPLICA_STICKY_SECONDS", int(os.getenv("REPLICA_STICKY_SECONDS", 5)))
+        app.config.setdefault("REPLICA_STICKY_COOKIE", "db_primary")
+        app.config.setdefault("REPLICA_RETRY_AFTER", int(os.getenv("REPLICA_RETRY_AFTER", 30)))
+
+        state = app.extensions["replica"] = _ReplicaState(app)
+        if state.enabled:
+            binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+            binds.setdefault(BIND_KEY, app.config["REPLICA_DATABASE_URI"])
+            app.after_request(self._remember_write)
+
+    @property
+    def _state(self):
+        return current_app.extensions["replica"]
+
+    # ---------- ROUTING ----------
+    def primary(self):
+        """Read the primary for the rest of this request (and, via the cookie, the next few)."""
+        if has_request_context():
+            g._replica_wrote = True
+
+    def _remember_write(self, response):
+        if g.get("_replica_wrote"):
+            sticky = current_app.config["REPLICA_STICKY_SECONDS"]
+            response.set_cookie(current_app.config["REPLICA_STICKY_COOKIE"], "1",
+                                max_age=sticky, httponly=True, samesite="Lax")
+        return response
+
+    # ---------- VIEWS ----------
+    def reads(self, view):
+        """Route the view's SELECTs to the replica; it must be safe to run twice."""
+        @wraps(view)
+        def decorated(*args, **kwargs):
+            state = self._state
+            if not state.available():
+                return view(*args, **kwargs)
+
+            g._replica_reads = True
+            try:
+                return view(*args, **kwargs)
+            except DBAPIError as exc:
+                if not g.get("_replica_used"):
+                    raise
+                state.mark_down(exc)
+                # Drop the replica connection and retry the view on the primary
+                current_app.extensions["sqlalchemy"].session.rollback()
+                g._replica_reads = False
+                return view(*args, **kwargs)
+            finally:
+                g.pop("_replica_reads", None)
+                g.pop("_replica_used", None)
+        return decorated
+
+    def stats(self):
+        state = self._state
+        return {
+            "enabled": state.enabled,
+            "available": state.available(),
+            "fallbacks": state.fallbacks,
+        }
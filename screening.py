@@ -0,0 +1,166 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+from flask import current_app
+
+from cache import LRUBackend
+from ingest import MODELS, ValidationError, validate
+
+# Left out of the dedup digest: they differ between two posts of the same form
+VOLATILE_FIELDS = {"created_at", "csrf_token", "g-recaptcha-response"}
+
+LINK_PATTERN = re.compile(r"https?://|www\.", re.IGNORECASE)
+MARKUP_PATTERN = re.compile(r"\[url[=\]]|<a\s+href", re.IGNORECASE)
+
+MESSAGES = {
+    "rate_limited": "Too many submissions from your network. Please try again later.",
+    "spam": "Your submission looks like spam and was not accepted.",
+}
+
+
+class SubmissionRejected(ValidationError):
+    def __init__(self, reason):
+        super().__init__(MESSAGES[reason])
+        self.reason = reason
+
+
+class SlidingWindow:
+    """Per-key event timestamps over the last `window` seconds, bounded to max_keys keys."""
+
+    def __init__(self, limit, window, max_keys=10000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._events = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key):
+        now = time.monotonic()
+        with self._lock:
+            events = self._events.get(key)
+            if events is None:
+                events = self._events[key] = deque()
+            while events and events[0] <= now - self.window:
+                events.popleft()
+            allowed = len(events) < self.limit
+            if allowed:
+                events.append(now)
+            self._events.move_to_end(key)
+            while len(self._events) > self.max_keys:
+                self._events.popitem(last=False)
+        return allowed
+
+
+class _ScreenState:
+    """One app's dedup window, IP windows and counters, kept in app.extensions["screening"]."""
+
+    def __init__(self, app):
+        self.enabled = app.config["SCREEN_ENABLED"]
+        self.max_links = app.config["SCREEN_MAX_LINKS"]
+        self.seen = LRUBackend(maxsize=app.config["SCREEN_DEDUP_SIZE"], ttl=app.config["SCREEN_DEDUP_WINDOW"])
+        self.windows = SlidingWindow(app.config["SCREEN_IP_LIMIT"], app.config["SCREEN_IP_WINDOW"])
+        self.ip_limit = app.config["CLIENT_IP_TRUSTED"]
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def count(self, kind, verdict):
+        with self.lock:
+            key = (kind, verdict)
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+
+class SubmissionScreen:
+    """
+    Cheap checks on public form submissions before anything touches the database.
+
+    In order: heuristics (too many links, forum link markup), a dedup window of
+    recent content digests (every field, normalised), and a per-IP
+    sliding-window limit, applied only when CLIENT_IP_TRUSTED says
+    request.remote_addr is the visitor's (see create_app). screen() returns the submission's digest, or None
+    for a duplicate, which the view drops as if it had been saved; it raises
+    SubmissionRejected (a ValidationError) for spam or rate-limited clients.
+    The view passes the digest to mark_seen() once the submission is stored,
+    so a failed write can be retried. State is per process, so with several
+    workers each one keeps its own window.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("SCREEN_ENABLED", os.getenv("SCREEN_ENABLED", "1") == "1")
+        app.config.setdefault("SCREEN_DEDUP_SIZE", int(os.getenv("SCREEN_DEDUP_SIZE", 10000)))
+        app.config.setdefault("SCREEN_DEDUP_WINDOW", int(os.getenv("SCREEN_DEDUP_WINDOW", 24 * 3600)))
+        app.config.setdefault("SCREEN_IP_LIMIT", int(os.getenv("SCREEN_IP_LIMIT", 10)))
+        app.config.setdefault("SCREEN_IP_WINDOW", int(os.getenv("SCREEN_IP_WINDOW", 3600)))
+        app.config.setdefault("SCREEN_MAX_LINKS", int(os.getenv("SCREEN_MAX_LINKS", 3)))
+
+        app.extensions["screening"] = _ScreenState(app)
+
+    @property
+    def _state(self):
+        return current_app.extensions["screening"]
+
+    # ---------- CHECKS ----------
+    @staticmethod
+    def digest(kind, fields):
+        parts = [kind] + [
+            f"{name}={' '.join(str(fields[name] or '').lower().split())}"
+            for name in sorted(fields) if name not in VOLATILE_FIELDS
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _looks_like_spam(fields, max_links):
+        text = " ".join(str(value) for value in fields.values() if isinstance(value, str))
+        return (
+            len(LINK_PATTERN.findall(text)) > max_links
+            or MARKUP_PATTERN.search(text) is not None
+        )
+
+    def screen(self, kind, fields, ip):
+        """The digest to store the submission under, or None to drop it as a duplicate."""
+        # Incomplete forms are the user's to fix, not evidence of spam
+        validate(kind, fields)
+        digest = self.digest(kind, fields)
+        state = self._state
+        if not state.enabled:
+            return digest
+
+        if self._looks_like_spam(fields, state.max_links):
+            state.count(kind, "spam")
+            raise SubmissionRejected("spam")
+
+        if state.seen.get(digest):
+            state.count(kind, "duplicate")
+            return None
+
+        if state.ip_limit and not state.windows.hit(ip or "unknown"):
+            state.count(kind, "rate_limited")
+            raise SubmissionRejected("rate_limited")
+
+        state.count(kind, "accepted")
+        return digest
+
+    def mark_seen(self, digest):
+        """Start the dedup window for a submission that has been stored."""
+        state = self._state
+        if state.enabled:
+            state.seen.set(digest, True)
+
+    def stats(self):
+        state = self._state
+        with state.lock:
+            counters = dict(state.counters)
+        return {
+            kind: {
+                verdict: counters.get((kind, verdict), 0)
+                for verdict in ("accepted", "duplicate", "rate_limited", "spam")
+            }
+            for kind in MODELS
+        }
@@ -0,0 +1,439 @@
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+
+from flask import request
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, URLSafeSerializer
+
+from cache import LRUBackend
+
+SID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{32,64}$")
+
+# Keys that make a session personal: its pages must not come from a shared cache
+PERSONAL_KEYS = ("_user_id", "_flashes")
+
+# Keys only a personal session can hold. Until it is loaded, a session without
+# the personal hint answers lookups of these (Flask-Login's "_remember" probe,
+# get_flashed_messages) as absent instead of going to the store.
+HINTED_KEYS = PERSONAL_KEYS + ("_remember", "_remember_seconds", "_fresh")
+
+
+# ---------- STORES ----------
+# A store keeps serialized session strings by id: get(sid), set(sid, data, ttl), delete(sid).
+class MemoryStore:
+    """In-process LRU. Sessions are per worker, so only for single-process runs."""
+
+    def __init__(self, app):
+        self.backend = LRUBackend(
+            maxsize=app.config["SESSION_MEMORY_SIZE"],
+            ttl=app.permanent_session_lifetime.total_seconds()
+        )
+
+    def get(self, sid):
+        return self.backend.get(sid)
+
+    def set(self, sid, data, ttl):
+        self.backend.set(sid, data)
+
+    def delete(self, sid):
+        self.backend.delete(sid)
+
+
+class SQLiteStore:
+    """Sessions in a local SQLite file (WAL), shared by the workers on one host."""
+
+    # Expired rows are purged on every N-th write
+    PURGE_EVERY = 500
+
+    def __init__(self, app):
+        self.path = app.config["SESSION_SQLITE_PATH"]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions "
+                "(sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, sid):
+        row = self._connect().execute(
+            "SELECT data FROM sessions WHERE sid = ? AND expires_at > ?", (sid, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, sid, data, ttl):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)",
+            (sid, data, time.time() + ttl)
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+
+    def delete(self, sid):
+        self._connect().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+
+class RedisStore:
+    """Shared store for multi-host deployments. Needs the optional `redis` package."""
+
+    def __init__(self, app, prefix="sw-session:"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("SESSION_BACKEND=redis but the redis package is not installed") from exc
+
+        self.client = redis.Redis.from_url(app.config["SESSION_REDIS_URL"])
+        self.prefix = prefix
+
+    def get(self, sid):
+        value = self.client.get(self.prefix + sid)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, sid, data, ttl):
+        self.client.set(self.prefix + sid, data, ex=max(int(ttl), 1))
+
+    def delete(self, sid):
+        self.client.delete(self.prefix + sid)
+
+
+STORES = {
+    "memory": MemoryStore,
+    "sqlite": SQLiteStore,
+    "redis": RedisStore,
+}
+
+
+def register_store(name, store_cls):
+    STORES[name] = store_cls
+
+
+# ---------- SESSION ----------
+class ServerSession(dict, SessionMixin):
+    """
+    Session whose contents live in a store, loaded on first use.
+
+    A request that never reads or writes the session never reaches the store.
+    `personal` answers "any PERSONAL_KEYS?" from a cookie hint until loaded,
+    and so do lookups of HINTED_KEYS. The CSRF token (`csrf_key`) lives in
+    its own signed cookie, so an anonymous form never creates a stored session.
+    """
+
+    def __init__(self, sid=None, loader=None, personal=False, csrf_key=None, csrf_token=None):
+        super().__init__()
+        self.sid = sid
+        self.new = sid is None
+        self.modified = False
+        self.accessed = False
+        self.loaded_user_id = None
+        self.csrf_key = csrf_key
+        self.csrf_token = csrf_token
+        self.csrf_modified = False
+        self._loader = loader
+        self._personal = personal and sid is not None
+
+    @property
+    def loaded(self):
+        return self._loader is None
+
+    @property
+    def personal(self):
+        if not self.loaded:
+            return self._personal
+        return any(super(ServerSession, self).__contains__(key) for key in PERSONAL_KEYS)
+
+    @property
+    def login_changed(self):
+        return super().get("_user_id") != self.loaded_user_id
+
+    def _load(self):
+        self.accessed = True
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            data = loader()
+            if data is None:
+                # Unknown or expired id: never adopt a client-chosen one
+                self.sid = None
+                self.new = True
+            else:
+                super().update(data)
+                self.loaded_user_id = data.get("_user_id")
+
+    def _changed(self):
+        self._load()
+        self.modified = True
+
+    def _absent(self, key):
+        return not self.loaded and not self._personal and key in HINTED_KEYS
+
+    def _set_csrf(self, value):
+        self.accessed = True
+        self.csrf_token = value
+        self.csrf_modified = True
+
+    # Reads
+    def __getitem__(self, key):
+        if key == self.csrf_key:
+            self.accessed = True
+            if self.csrf_token is None:
+                raise KeyError(key)
+            return self.csrf_token
+        if self._absent(key):
+            raise KeyError(key)
+        self._load()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        if key == self.csrf_key:
+            self.accessed = True
+            return self.csrf_token is not None
+        if self._absent(key):
+            return False
+        self._load()
+        return super().__contains__(key)
+
+    def __iter__(self):
+        self._load()
+        return super().__iter__()
+
+    def __len__(self):
+        self._load()
+        return super().__len__()
+
+    def __eq__(self, other):
+        self._load()
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._load()
+        return f"<{type(self).__name__} {super().__repr__()}>"
+
+    def get(self, key, default=None):
+        if key == self.csrf_key:
+            self.accessed = True
+            return default if self.csrf_token is None else self.csrf_token
+        if self._absent(key):
+            return default
+        self._load()
+        return super().get(key, default)
+
+    def keys(self):
+        self._load()
+        return super().keys()
+
+    def values(self):
+        self._load()
+        return super().values()
+
+    def items(self):
+        self._load()
+        return super().items()
+
+    def copy(self):
+        self._load()
+        return dict(self)
+
+    # Writes
+    def __setitem__(self, key, value):
+        if key == self.csrf_key:
+            self._set_csrf(value)
+            return
+        self._changed()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        if key == self.csrf_key:
+            if self.csrf_token is None:
+                raise KeyError(key)
+            self._set_csrf(None)
+            return
+        self._changed()
+        super().__delitem__(key)
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return super().setdefault(key, default)
+
+    def pop(self, key, *default):
+        if key == self.csrf_key:
+            value = self.get(key, *default) if default else self[key]
+            self._set_csrf(None)
+            return value
+        self._changed()
+        return super().pop(key, *default)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def update(self, *args, **kwargs):
+        self._changed()
+        super().update(*args, **kwargs)
+
+    def clear(self):
+        self._changed()
+        super().clear()
+
+
+class ServerSessionInterface(SessionInterface):
+    """
+    Keeps only a random session id in the cookie; the data goes to `store`.
+
+    The id is replaced whenever the signed-in user changes, so an id planted
+    before login is useless after it. A second "<cookie name>_personal" cookie
+    marks sessions holding a login or flashes, letting the page caches skip
+    the store lookup for everyone else. The raw CSRF token goes in a third,
+    signed "<cookie name>_csrf" cookie rather than the store.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store):
+        self.store = store
+
+    def _load(self, sid):
+        data = self.store.get(sid)
+        if data is None:
+            return None
+        try:
+            return self.serializer.loads(data)
+        except ValueError:
+            return None
+
+    def get_personal_cookie_name(self, app):
+        return f"{self.get_cookie_name(app)}_personal"
+
+    def get_csrf_cookie_name(self, app):
+        return f"{self.get_cookie_name(app)}_csrf"
+
+    def get_csrf_signer(self, app):
+        return URLSafeSerializer(app.secret_key, salt="csrf-cookie")
+
+    def _csrf_token(self, app, request):
+        value = request.cookies.get(self.get_csrf_cookie_name(app))
+        if not value:
+            return None
+        try:
+            return self.get_csrf_signer(app).loads(value)
+        except BadSignature:
+            return None
+
+    def open_session(self, app, request):
+        csrf = dict(
+            csrf_key=app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token"),
+            csrf_token=self._csrf_token(app, request),
+        )
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and SID_PATTERN.match(sid):
+            personal = request.cookies.get(self.get_personal_cookie_name(app)) == "1"
+            return ServerSession(sid, loader=lambda: self._load(sid), personal=personal, **csrf)
+        return ServerSession(**csrf)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        cookie = dict(
+            domain=self.get_cookie_domain(app),
+            path=self.get_cookie_path(app),
+            secure=self.get_cookie_secure(app),
+            partitioned=self.get_cookie_partitioned(app),
+            samesite=self.get_cookie_samesite(app),
+            httponly=self.get_cookie_httponly(app),
+        )
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if session.csrf_modified:
+            # A browser-session cookie: reading session.permanent would load the
+            # session, and a lost token is simply regenerated by the next form
+            csrf_name = self.get_csrf_cookie_name(app)
+            if session.csrf_token is None:
+                response.delete_cookie(csrf_name, **cookie)
+            else:
+                response.set_cookie(csrf_name, self.get_csrf_signer(app).dumps(session.csrf_token), **cookie)
+
+        # Never touched during the request: nothing to write or refresh
+        if not session.loaded:
+            return
+
+        expires = self.get_expiration_time(app, session)
+
+        personal_name = self.get_personal_cookie_name(app)
+        if session.modified:
+            if session.personal:
+                response.set_cookie(personal_name, "1", expires=expires, **cookie)
+            elif personal_name in request.cookies:
+                response.delete_cookie(personal_name, **cookie)
+
+        if not session:
+            if session.modified and session.sid:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, **cookie)
+            return
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        if session.sid is not None and session.login_changed:
+            # Login or logout: retire the old id rather than carry it over
+            self.store.delete(session.sid)
+            session.sid = None
+
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(32)
+
+        self.store.set(
+            session.sid,
+            self.serializer.dumps(dict(session)),
+            app.permanent_session_lifetime.total_seconds()
+        )
+        response.set_cookie(name, session.sid, expires=expires, **cookie)
+
+
+class ServerSessions:
+    """
+    Optional server-side sessions.
+
+    SESSION_BACKEND=cookie (the default) keeps Flask's signed cookies. memory,
+    sqlite or redis store the data server side under an opaque id. Entries
+    expire after PERMANENT_SESSION_LIFETIME.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("SESSION_BACKEND", os.getenv("SESSION_BACKEND", "cookie"))
+        app.config.setdefault("SESSION_MEMORY_SIZE", int(os.getenv("SESSION_MEMORY_SIZE", 10000)))
+        app.config.setdefault("SESSION_SQLITE_PATH", os.getenv("SESSION_SQLITE_PATH", os.path.join(app.instance_path, "sessions.sqlite")))
+        app.config.setdefault("SESSION_REDIS_URL", os.getenv("SESSION_REDIS_URL"))
+
+        store = None
+        backend = app.config["SESSION_BACKEND"]
+        if backend != "cookie":
+            if backend not in STORES:
+                raise ValueError(f"Unknown SESSION_BACKEND: {backend!r}")
+            store = STORES[backend](app)
+            app.session_interface = ServerSessionInterface(store)
+
+        # The app's store, or None with cookie sessions
+        app.extensions["server_sessions"] = store
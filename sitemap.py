@@ -0,0 +1,186 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+from flask import abort, current_app, make_response, request
+from jinja2 import TemplateNotFound, meta
+
+XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+class SitemapDocument:
+    def __init__(self, body):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+
+
+class _SitemapState:
+    """One app's built documents, kept in app.extensions["sitemap"]."""
+
+    def __init__(self):
+        self.documents = {}
+        self.fingerprint = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+
+class Sitemap:
+    """
+    sitemap.xml generated from app.url_map.
+
+    Every GET rule without URL arguments is listed unless its path starts with
+    one of SITEMAP_EXCLUDE. @sitemap.page(changefreq=..., priority=...,
+    template=...) adds metadata; lastmod is the newest mtime of the template and
+    everything it extends or includes. The XML is built once into bytes and
+    rebuilt only when the rules or those template files change (checked at most
+    every SITEMAP_CHECK_INTERVAL seconds). Past SITEMAP_MAX_URLS entries,
+    /sitemap.xml becomes an index of /sitemap-<n>.xml shards.
+    """
+
+    def __init__(self, app=None):
+        # Filled by @page at import time, so shared by every app
+        self.pages = {}
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault(
+            "SITEMAP_BASE_URL",
+            os.getenv("SITEMAP_BASE_URL") or os.getenv("SITE_URL") or "https://www.spydraweb.com/"
+        )
+        app.config.setdefault("SITEMAP_EXCLUDE", [
+            "/admin", "/static", "/404", "/healthz", "/metrics", "/robots.txt", "/sitemap",
+        ])
+        app.config.setdefault("SITEMAP_MAX_URLS", int(os.getenv("SITEMAP_MAX_URLS", 50000)))
+        app.config.setdefault("SITEMAP_CHECK_INTERVAL", float(os.getenv("SITEMAP_CHECK_INTERVAL", 10)))
+
+        app.extensions["sitemap"] = _SitemapState()
+
+    def page(self, changefreq=None, priority=None, template=None):
+        def decorator(view):
+            self.pages[view.__name__] = dict(changefreq=changefreq, priority=priority, template=template)
+            return view
+        return decorator
+
+    # ---------- DISCOVERY ----------
+    def _rules(self):
+        exclude = tuple(current_app.config["SITEMAP_EXCLUDE"])
+        rules = [
+            rule for rule in current_app.url_map.iter_rules()
+            if "GET" in (rule.methods or ()) and not rule.arguments and not rule.rule.startswith(exclude)
+        ]
+        return sorted(rules, key=lambda rule: rule.rule)
+
+    def _template_files(self, name, seen=None):
+        """Paths of `name` and every template it extends, includes or imports."""
+        seen = set() if seen is None else seen
+        if name in seen:
+            return []
+        seen.add(name)
+
+        env = current_app.jinja_env
+        try:
+            source, filename, _ = env.loader.get_source(env, name)
+        except TemplateNotFound:
+            return []
+
+        files = [filename]
+        for referenced in meta.find_referenced_templates(env.parse(source)):
+            if referenced:
+                files.extend(self._template_files(referenced, seen))
+        return files
+
+    def _entries(self):
+        entries = []
+        for rule in self._rules():
+            meta_ = self.pages.get(rule.endpoint, {})
+            files = self._template_files(meta_["template"]) if meta_.get("template") else []
+            mtimes = [os.path.getmtime(path) for path in files if os.path.exists(path)]
+            entries.append(dict(
+                path=rule.rule,
+                lastmod=max(mtimes) if mtimes else None,
+                changefreq=meta_.get("changefreq"),
+                priority=meta_.get("priority"),
+            ))
+        return entries
+
+    def _current_fingerprint(self, entries):
+        return tuple((e["path"], e["lastmod"]) for e in entries) + (current_app.config["SITEMAP_BASE_URL"],)
+
+    # ---------- RENDERING ----------
+    @staticmethod
+    def _w3c(timestamp):
+        return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+    def _urlset(self, entries, base):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{XMLNS}">']
+        for entry in entries:
+            lines.append("  <url>")
+            lines.append(f"    <loc>{escape(base + entry['path'])}</loc>")
+            if entry["lastmod"]:
+                lines.append(f"    <lastmod>{self._w3c(entry['lastmod'])}</lastmod>")
+            if entry["changefreq"]:
+                lines.append(f"    <changefreq>{entry['changefreq']}</changefreq>")
+            if entry["priority"] is not None:
+                lines.append(f"    <priority>{entry['priority']:.1f}</priority>")
+            lines.append("  </url>")
+        lines.append("</urlset>")
+        return SitemapDocument(("\n".join(lines) + "\n").encode("utf-8"))
+
+    def _index(self, shards, base):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{XMLNS}">']
+        for number, entries in enumerate(shards, 1):
+            lastmods = [e["lastmod"] for e in entries if e["lastmod"]]
+            lines.append("  <sitemap>")
+            lines.append(f"    <loc>{escape(base)}/sitemap-{number}.xml</loc>")
+            if lastmods:
+                lines.append(f"    <lastmod>{self._w3c(max(lastmods))}</lastmod>")
+            lines.append("  </sitemap>")
+        lines.append("</sitemapindex>")
+        return SitemapDocument(("\n".join(lines) + "\n").encode("utf-8"))
+
+    def build(self, entries):
+        base = current_app.config["SITEMAP_BASE_URL"].rstrip("/")
+        size = current_app.config["SITEMAP_MAX_URLS"]
+
+        if len(entries) <= size:
+            return {"sitemap.xml": self._urlset(entries, base)}
+
+        shards = [entries[i:i + size] for i in range(0, len(entries), size)]
+        documents = {"sitemap.xml": self._index(shards, base)}
+        for number, shard in enumerate(shards, 1):
+            documents[f"sitemap-{number}.xml"] = self._urlset(shard, base)
+        return documents
+
+    def documents(self):
+        state = current_app.extensions["sitemap"]
+        now = time.monotonic()
+        if state.fingerprint is not None and now - state.checked_at < current_app.config["SITEMAP_CHECK_INTERVAL"]:
+            return state.documents
+
+        with state.lock:
+            entries = self._entries()
+            fingerprint = self._current_fingerprint(entries)
+            if fingerprint != state.fingerprint:
+                state.documents = self.build(entries)
+                state.fingerprint = fingerprint
+            state.checked_at = now
+        return state.documents
+
+    # ---------- SERVING ----------
+    def response(self, name="sitemap.xml"):
+        document = self.documents().get(name)
+        if document is None:
+            abort(404)
+
+        response = make_response(document.body)
+        response.mimetype = "application/xml"
+        # Weak: the same document may go out gzip- or br-encoded
+        response.set_etag(document.etag, weak=True)
+        response.cache_control.public = True
+        response.cache_control.max_age = 3600
+        return response.make_conditional(request)
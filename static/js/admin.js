@@ -46,3 +46,132 @@ function toggleContacted(id) {
     console.log("Toggle contacted", id);
     // fetch(`/admin/inquiries/${id}/toggle`, { method: "POST" })
 }
+
+// ---------- INFINITE SCROLL (contact messages, reviews) ----------
+const listingRenderers = {
+  contact(item) {
+    const row = document.createElement("tr");
+    [item.name, item.email, item.phone, item.subject, item.created_at, item.is_read ? "Read" : "Unread"]
+      .forEach(value => {
+        const cell = document.createElement("td");
+        cell.textContent = value;
+        row.appendChild(cell);
+      });
+
+    const actions = document.createElement("td");
+    const link = document.createElement("a");
+    link.href = item.url;
+    link.className = "btn-primary";
+    link.textContent = "View";
+    actions.appendChild(link);
+    row.appendChild(actions);
+    return row;
+  },
+
+  review(item) {
+    const card = document.createElement("article");
+    card.className = "review-admin-card";
+
+    const top = document.createElement("div");
+    top.className = "review-admin-top";
+    const name = document.createElement("h3");
+    name.textContent = item.name;
+    const rating = document.createElement("span");
+    rating.className = "review-admin-rating";
+    rating.textContent = `${item.rating}/5`;
+    top.append(name, rating);
+
+    const email = document.createElement("p");
+    email.className = "review-admin-email";
+    email.textContent = item.email;
+
+    const message = document.createElement("p");
+    message.className = "review-admin-message";
+    message.textContent = item.preview;
+
+    const link = document.createElement("a");
+    link.href = item.url;
+    link.textContent = "Read full review";
+
+    const date = document.createElement("p");
+    date.className = "review-admin-date";
+    date.textContent = item.created_at;
+
+    card.append(top, email, message, link, date);
+    return card;
+  }
+};
+
+function setupInfiniteScroll() {
+  const container = document.getElementById("listingRows");
+  const pager = document.getElementById("listingPager");
+  if (!container || !pager || !container.dataset.next || !("IntersectionObserver" in window)) return;
+
+  const render = listingRenderers[container.dataset.kind];
+  let loading = false;
+
+  const observer = new IntersectionObserver(entries => {
+    if (!entries[0].isIntersecting || loading || !container.dataset.next) return;
+    loading = true;
+
+    fetch(container.dataset.next, { headers: { "Accept": "application/json" } })
+      .then(res => res.json())
+      .then(data => {
+        data.items.forEach(item => container.appendChild(render(item)));
+        container.dataset.next = data.next || "";
+        if (!data.next) {
+          observer.disconnect();
+          pager.remove();
+        }
+      })
+      .finally(() => { loading = false; });
+  });
+
+  pager.querySelector("a").style.visibility = "hidden";
+  observer.observe(pager);
+}
+
+document.addEventListener("DOMContentLoaded", setupInfiniteScroll);
+
+// ---------- BULK INQUIRY ACTIONS ----------
+function setupBulkActions() {
+  const bar = document.getElementById("bulkBar");
+  if (!bar) return;
+
+  const boxes = () => Array.from(document.querySelectorAll(".bulk-select"));
+  const allMatching = document.getElementById("bulkAllMatching");
+
+  document.getElementById("bulkSelectPage").addEventListener("change", e => {
+    boxes().forEach(box => { box.checked = e.target.checked; });
+  });
+
+  bar.querySelectorAll("[data-bulk]").forEach(button => {
+    button.addEventListener("click", () => {
+      const payload = { action: button.dataset.bulk };
+      if (allMatching.checked) {
+        Object.assign(payload, { scope: "filter", search: bar.dataset.search, status: bar.dataset.status },
+                      JSON.parse(bar.dataset.options));
+      } else {
+        payload.ids = boxes().filter(box => box.checked).map(box => Number(box.value));
+        if (!payload.ids.length) return;
+      }
+      if (payload.action === "delete" && !confirm("Delete the selected inquiries permanently?")) return;
+
+      fetch(bar.dataset.url, {
+        method: "POST",
+        headers: { "Content-Type": "application/json", "X-CSRFToken": bar.dataset.csrf },
+        body: JSON.stringify(payload)
+      })
+        .then(res => res.json())
+        .then(data => {
+          if (data.status !== "success") {
+            alert(data.message);
+            return;
+          }
+          location.reload();
+        });
+    });
+  });
+}
+
+document.addEventListener("DOMContentLoaded", setupBulkActions);
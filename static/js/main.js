@@ -62,6 +62,9 @@ document.addEventListener("DOMContentLoaded", function () {
   ];
 
   function getThemeImageSources(image) {
+    // Responsive images only switch when responsive_image() found a dark twin
+    if (image.hasAttribute("srcset") && !image.dataset.darkSrc) return null;
+
     const rawSrc = image.getAttribute("src");
     if (!rawSrc || !/\.png(\?.*)?$/i.test(rawSrc)) return null;
 
@@ -84,6 +87,19 @@ document.addEventListener("DOMContentLoaded", function () {
       if (image.getAttribute("src") !== nextSrc) {
         image.setAttribute("src", nextSrc);
       }
+      applyThemeSrcsets(image, isDark);
+    });
+  }
+
+  function applyThemeSrcsets(image, isDark) {
+    const picture = image.closest("picture");
+    if (!picture) return;
+
+    picture.querySelectorAll("source, img").forEach(element => {
+      const nextSrcset = isDark ? element.dataset.darkSrcset : element.dataset.lightSrcset;
+      if (nextSrcset && element.getAttribute("srcset") !== nextSrcset) {
+        element.setAttribute("srcset", nextSrcset);
+      }
     });
   }
 
@@ -0,0 +1,198 @@
+import os
+from datetime import date, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from background import PeriodicWorker
+from ingest import submissions_inserting
+from model import db, User, ContactMessage, Review, DashboardCounter, InquiryDailyCount
+
+COUNTERS = (
+    "inquiries_total",
+    "inquiries_contacted",
+    "contacts_total",
+    "contacts_unread",
+    "reviews_total",
+) + tuple(f"reviews_rating_{rating}" for rating in range(1, 6))
+
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class DashboardStats:
+    """
+    Dashboard totals kept in small summary tables.
+
+    Writers adjust the counters inside their own transaction (inserts via the
+    submissions_inserting signal, toggles and deletes explicitly), so reading
+    the dashboard is a couple of primary-key lookups whatever the table sizes.
+    reconcile() recomputes everything from the source tables to correct drift;
+    run it from cron with `flask stats reconcile` or set STATS_RECONCILE_INTERVAL.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("STATS_RECONCILE_INTERVAL", int(os.getenv("STATS_RECONCILE_INTERVAL", 0)))
+        app.config.setdefault("STATS_SERIES_DAYS", 30)
+
+        submissions_inserting.connect(self.on_inserting, weak=False)
+        worker = app.extensions["dashboard_stats"] = PeriodicWorker(
+            app, "stats-reconciler", app.config["STATS_RECONCILE_INTERVAL"], self.reconcile
+        )
+        if app.config["STATS_RECONCILE_INTERVAL"] > 0:
+            app.before_request(worker.start)
+
+        @app.cli.group("stats")
+        def stats_group():
+            """Dashboard statistics."""
+
+        @stats_group.command("reconcile")
+        @with_appcontext
+        def reconcile_command():
+            """Recompute dashboard counters from the source tables."""
+            self.reconcile()
+            click.echo("Dashboard counters reconciled.")
+
+    # ---------- INCREMENTAL UPDATES ----------
+    def _upsert_add(self, model, key, column, values):
+        """values: {key value: delta}. Adds deltas, creating missing rows."""
+        values = {k: v for k, v in values.items() if v}
+        if not values:
+            return
+
+        table = model.__table__
+        dialect = db.session.get_bind().dialect.name
+        if dialect in UPSERT_INSERTS:
+            stmt = UPSERT_INSERTS[dialect](table).values(
+                [{key: k, column: delta} for k, delta in values.items()]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[key],
+                set_={column: table.c[column] + stmt.excluded[column]}
+            )
+            db.session.execute(stmt)
+            return
+
+        for k, delta in values.items():
+            updated = db.session.execute(
+                table.update().where(table.c[key] == k).values({column: table.c[column] + delta})
+            )
+            if updated.rowcount == 0:
+                db.session.execute(insert(table).values({key: k, column: delta}))
+
+    def add(self, **deltas):
+        self._upsert_add(DashboardCounter, "name", "value", deltas)
+
+    def add_days(self, deltas):
+        self._upsert_add(InquiryDailyCount, "day", "count", deltas)
+
+    def on_inserting(self, kind, rows):
+        if kind == "inquiry":
+            days = {}
+            for row in rows:
+                day = row["created_at"].date()
+                days[day] = days.get(day, 0) + 1
+            self.add(inquiries_total=len(rows))
+            self.add_days(days)
+
+        elif kind == "contact":
+            self.add(contacts_total=len(rows), contacts_unread=len(rows))
+
+        elif kind == "review":
+            ratings = {}
+            for row in rows:
+                name = f"reviews_rating_{row['rating']}"
+                ratings[name] = ratings.get(name, 0) + 1
+            self.add(reviews_total=len(rows), **ratings)
+
+    def inquiry_deleted(self, inquiry):
+        self.add(
+            inquiries_total=-1,
+            inquiries_contacted=-1 if inquiry.is_contacted else 0
+        )
+        if inquiry.created_at:
+            self.add_days({inquiry.created_at.date(): -1})
+
+    def inquiries_deleted(self, groups):
+        """groups: (is_contacted, created day, count) rows for a bulk delete."""
+        total = contacted = 0
+        days = {}
+        for is_contacted, day, count in groups:
+            total += count
+            contacted += count if is_contacted else 0
+            if day is not None:
+                # func.date() comes back as a string on SQLite
+                day = date.fromisoformat(day) if isinstance(day, str) else day
+                days[day] = days.get(day, 0) - count
+        self.add(inquiries_total=-total, inquiries_contacted=-contacted)
+        self.add_days(days)
+
+    def inquiry_toggled(self, inquiry):
+        self.add(inquiries_contacted=1 if inquiry.is_contacted else -1)
+
+    def contact_read(self):
+        self.add(contacts_unread=-1)
+
+    # ---------- READ ----------
+    def snapshot(self):
+        counters = dict.fromkeys(COUNTERS, 0)
+        counters.update(db.session.execute(
+            select(DashboardCounter.name, DashboardCounter.value)
+        ).all())
+
+        days = current_app.config["STATS_SERIES_DAYS"]
+        start = date.today() - timedelta(days=days - 1)
+        per_day = dict(db.session.execute(
+            select(InquiryDailyCount.day, InquiryDailyCount.count).where(InquiryDailyCount.day >= start)
+        ).all())
+
+        return {
+            "inquiries_total": counters["inquiries_total"],
+            "inquiries_contacted": counters["inquiries_contacted"],
+            "inquiries_pending": counters["inquiries_total"] - counters["inquiries_contacted"],
+            "contacts_total": counters["contacts_total"],
+            "contacts_unread": counters["contacts_unread"],
+            "reviews_total": counters["reviews_total"],
+            "rating_histogram": {rating: counters[f"reviews_rating_{rating}"] for rating in range(5, 0, -1)},
+            "inquiry_series": [
+                (start + timedelta(days=i), per_day.get(start + timedelta(days=i), 0))
+                for i in range(days)
+            ],
+        }
+
+    # ---------- RECONCILE ----------
+    def reconcile(self):
+        counts = {
+            "inquiries_total": select(func.count(User.id)),
+            "inquiries_contacted": select(func.count(User.id)).where(User.is_contacted == True),
+            "contacts_total": select(func.count(ContactMessage.id)),
+            "contacts_unread": select(func.count(ContactMessage.id)).where(ContactMessage.is_read == False),
+            "reviews_total": select(func.count(Review.id)),
+        }
+        values = {name: db.session.execute(query).scalar() or 0 for name, query in counts.items()}
+        values.update({f"reviews_rating_{rating}": 0 for rating in range(1, 6)})
+        for rating, count in db.session.execute(
+            select(Review.rating, func.count(Review.id)).group_by(Review.rating)
+        ).all():
+            if 1 <= rating <= 5:
+                values[f"reviews_rating_{rating}"] = count
+
+        day = func.date(User.created_at)
+        db.session.execute(delete(DashboardCounter))
+        db.session.execute(insert(DashboardCounter), [{"name": k, "value": v} for k, v in values.items()])
+        db.session.execute(delete(InquiryDailyCount))
+        db.session.execute(insert(InquiryDailyCount).from_select(
+            ["day", "count"],
+            select(day, func.count(User.id)).where(User.created_at.isnot(None)).group_by(day)
+        ))
+        db.session.commit()
+